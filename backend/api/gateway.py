@@ -4,14 +4,13 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from typing import Optional
 import uuid
-import json
 
 from .models import (
     ChatCompletionRequest, ChatCompletionResponse,
     ModelInfo, ModelList, ChatMessage, ChatCompletionChoice
 )
 from .transform import transform_openai_request, transform_council_response
-from .streaming import stream_openai_response
+from .streaming import stream_openai_response, format_sse_event, SSE_DONE
 from .auth import verify_api_key
 from ..config import API_GATEWAY_CONFIG, SPECIALIZED_COUNCILS
 from ..council import (
@@ -213,7 +212,7 @@ async def create_streaming_completion(
             "model": request.model,
             "choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]
         }
-        yield f"data: {json.dumps(initial)}\n\n"
+        yield format_sse_event(initial)
 
         try:
             # Get council config
@@ -241,7 +240,7 @@ async def create_streaming_completion(
                         "model": request.model,
                         "choices": [{"index": 0, "delta": {"content": chunk_text}, "finish_reason": None}]
                     }
-                    yield f"data: {json.dumps(chunk)}\n\n"
+                    yield format_sse_event(chunk)
                     await asyncio.sleep(0.01)  # Small delay for streaming effect
 
         except Exception as e:
@@ -252,7 +251,7 @@ async def create_streaming_completion(
                 "model": request.model,
                 "choices": [{"index": 0, "delta": {"content": f"[Error: {str(e)}]"}, "finish_reason": None}]
             }
-            yield f"data: {json.dumps(error_chunk)}\n\n"
+            yield format_sse_event(error_chunk)
 
         # Final chunk
         final = {
@@ -262,8 +261,8 @@ async def create_streaming_completion(
             "model": request.model,
             "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
         }
-        yield f"data: {json.dumps(final)}\n\n"
-        yield "data: [DONE]\n\n"
+        yield format_sse_event(final)
+        yield SSE_DONE
 
     return StreamingResponse(
         generate(),
@@ -271,5 +270,6 @@ async def create_streaming_completion(
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
         }
     )
@@ -1,16 +1,19 @@
 """Streaming response conversion for OpenAI compatibility."""
 
-import json
+import orjson
 import time
 import uuid
 from typing import AsyncGenerator, Dict, Any
 
 
+SSE_DONE = b"data: [DONE]\n\n"
+
+
 async def stream_openai_response(
-    council_stream: AsyncGenerator[str, None],
+    council_stream: AsyncGenerator[bytes, None],
     model: str,
     request_id: str = None
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """
     Convert council SSE stream to OpenAI streaming format.
 
@@ -37,68 +40,62 @@ async def stream_openai_response(
             "finish_reason": None
         }]
     }
-    yield f"data: {json.dumps(initial_chunk)}\n\n"
-
-    # Process council events
-    accumulated_content = ""
-
-    async for event in council_stream:
-        # Parse council event
-        if event.startswith("data: "):
+    yield format_sse_event(initial_chunk)
+
+    def content_chunk(text: str) -> bytes:
+        """Build one content delta chunk."""
+        return format_sse_event({
+            "id": request_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "delta": {"content": text},
+                "finish_reason": None
+            }]
+        })
+
+    # Process council events; a chunk may hold several SSE frames or end
+    # part-way through one, so split on the frame separator and keep the rest
+    buffer = b""
+
+    async for chunk in council_stream:
+        buffer += chunk
+        *frames, buffer = buffer.split(b"\n\n")
+
+        for event in frames:
+            # Parse council event
+            if not event.startswith(b"data: "):
+                continue
             try:
-                data = json.loads(event[6:])
-                event_type = data.get("type", "")
-
-                # Handle different event types
-                if event_type == "stage3_complete":
-                    # Main response content
-                    stage3_data = data.get("data", {})
-                    content = stage3_data.get("response", stage3_data.get("content", ""))
-
-                    # Stream content in chunks
-                    chunk_size = 50  # Characters per chunk
-                    for i in range(0, len(content), chunk_size):
-                        chunk_text = content[i:i + chunk_size]
-                        chunk = {
-                            "id": request_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": model,
-                            "choices": [{
-                                "index": 0,
-                                "delta": {"content": chunk_text},
-                                "finish_reason": None
-                            }]
-                        }
-                        yield f"data: {json.dumps(chunk)}\n\n"
-
-                elif event_type == "cache_hit":
-                    # Cache hit - will get stage3_complete from cached data
-                    pass
-
-                elif event_type == "complete":
-                    # Council finished - send done
-                    pass
-
-                elif event_type == "error":
-                    # Error occurred
-                    error_msg = data.get("message", "Unknown error")
-                    error_chunk = {
-                        "id": request_id,
-                        "object": "chat.completion.chunk",
-                        "created": created,
-                        "model": model,
-                        "choices": [{
-                            "index": 0,
-                            "delta": {"content": f"[Error: {error_msg}]"},
-                            "finish_reason": None
-                        }]
-                    }
-                    yield f"data: {json.dumps(error_chunk)}\n\n"
-
-            except json.JSONDecodeError:
+                data = orjson.loads(event[6:])
+            except orjson.JSONDecodeError:
+                continue
+            event_type = data.get("type", "")
+
+            # Handle different event types
+            if event_type in ("stage3_complete", "cache_hit_full"):
+                # Main response content; a full cache hit carries it under stage3
+                stage3_data = data.get("data", {})
+                if event_type == "cache_hit_full":
+                    stage3_data = stage3_data.get("stage3") or {}
+                content = stage3_data.get("response", stage3_data.get("content", ""))
+
+                # Stream content in chunks
+                chunk_size = 50  # Characters per chunk
+                for i in range(0, len(content), chunk_size):
+                    yield content_chunk(content[i:i + chunk_size])
+
+            elif event_type == "complete":
+                # Council finished - send done
                 pass
 
+            elif event_type == "error":
+                # Error occurred
+                error_msg = data.get("message", "Unknown error")
+                yield content_chunk(f"[Error: {error_msg}]")
+
     # Send final chunk with finish_reason
     final_chunk = {
         "id": request_id,
@@ -111,11 +108,11 @@ async def stream_openai_response(
             "finish_reason": "stop"
         }]
     }
-    yield f"data: {json.dumps(final_chunk)}\n\n"
-    yield "data: [DONE]\n\n"
+    yield format_sse_event(final_chunk)
+    yield SSE_DONE
 
 
-def format_sse_event(data: Dict[str, Any]) -> str:
+def format_sse_event(data: Dict[str, Any]) -> bytes:
     """
     Format data as an SSE event.
 
@@ -123,6 +120,6 @@ def format_sse_event(data: Dict[str, Any]) -> str:
         data: Data to format
 
     Returns:
-        SSE-formatted string
+        SSE frame as UTF-8 bytes, ready to send without re-encoding
     """
-    return f"data: {json.dumps(data)}\n\n"
+    return b"data: " + orjson.dumps(data) + b"\n\n"
@@ -3,6 +3,7 @@
 from .storage import CachedResponse, SemanticCache, get_cache
 from .similarity import calculate_query_similarity
 from .middleware import check_cache, cache_response, get_cache_stats, clear_cache
+from .response import cached_endpoint, invalidate
 
 __all__ = [
     'CachedResponse',
@@ -13,4 +14,6 @@ __all__ = [
     'cache_response',
     'get_cache_stats',
     'clear_cache',
+    'cached_endpoint',
+    'invalidate',
 ]
@@ -0,0 +1,96 @@
+"""Short-lived in-process cache for read-mostly GET endpoints."""
+
+import asyncio
+import functools
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Set, Tuple
+from ..config import RESPONSE_CACHE_CONFIG
+
+
+# namespace -> {key: (stored_at, value)}
+_entries: Dict[str, Dict[Tuple, Tuple[float, Any]]] = defaultdict(dict)
+# Bumped on invalidation so in-flight refreshes don't write back old data
+_generations: Dict[str, int] = defaultdict(int)
+_refreshing: Set[Tuple] = set()
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def cached_endpoint(namespace: str) -> Callable:
+    """
+    Cache an async endpoint's result per set of arguments.
+
+    Entries are fresh for the namespace's configured TTL. For a further
+    stale window the old value is returned immediately while a single
+    background refresh recomputes it.
+
+    Args:
+        namespace: Group name used for TTL lookup and invalidation
+
+    Returns:
+        Decorator for an async endpoint function
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_CONFIG.get("enabled", True):
+                return await func(*args, **kwargs)
+
+            ttl = RESPONSE_CACHE_CONFIG["ttl_seconds"].get(namespace, 60)
+            stale = RESPONSE_CACHE_CONFIG.get("stale_seconds", 60)
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+
+            entry = _entries[namespace].get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[0]
+                if age < ttl:
+                    return entry[1]
+                if age < ttl + stale:
+                    _schedule_refresh(namespace, key, func, args, kwargs)
+                    return entry[1]
+
+            generation = _generations[namespace]
+            value = await func(*args, **kwargs)
+            _store(namespace, key, value, generation)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def _store(namespace: str, key: Tuple, value: Any, generation: int):
+    """Store a value unless the namespace was invalidated meanwhile."""
+    if _generations[namespace] == generation:
+        _entries[namespace][key] = (time.monotonic(), value)
+
+
+def _schedule_refresh(namespace: str, key: Tuple, func: Callable, args, kwargs):
+    """Start a background refresh for a stale entry if none is running."""
+    refresh_key = (namespace, key)
+    if refresh_key in _refreshing:
+        return
+    _refreshing.add(refresh_key)
+
+    async def refresh():
+        generation = _generations[namespace]
+        try:
+            _store(namespace, key, await func(*args, **kwargs), generation)
+        except Exception as e:
+            print(f"Error refreshing cached {func.__name__}: {e}")
+        finally:
+            _refreshing.discard(refresh_key)
+
+    task = asyncio.create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def invalidate(namespace: str):
+    """
+    Drop every cached entry in a namespace.
+
+    Args:
+        namespace: The namespace to clear
+    """
+    _generations[namespace] += 1
+    _entries.pop(namespace, None)
@@ -4,8 +4,20 @@ from typing import Dict, Set, Optional, List
 from fastapi import WebSocket
 from dataclasses import dataclass, field
 from datetime import datetime
-import json
 import asyncio
+import orjson
+
+
+# Cursor moves and typing toggles are coalesced per user and flushed at
+# most this often, so a fast mouse doesn't fan out hundreds of broadcasts
+CURSOR_FLUSH_INTERVAL = 1 / 30
+TYPING_FLUSH_INTERVAL = 0.25
+
+
+def _release_task(tasks: Dict[str, asyncio.Task], user_id: str):
+    """Unregister the current task, unless a newer one has replaced it."""
+    if tasks.get(user_id) is asyncio.current_task():
+        del tasks[user_id]
 
 
 @dataclass
@@ -26,6 +38,14 @@ class ConnectionManager:
         self.active_connections: Dict[str, Dict[str, ConnectedUser]] = {}
         # user_id -> conversation_id (track which room each user is in)
         self.user_rooms: Dict[str, str] = {}
+        # user_id -> latest unsent cursor position / typing state
+        self._pending_cursors: Dict[str, dict] = {}
+        self._pending_typing: Dict[str, bool] = {}
+        # user_id -> last typing state actually broadcast
+        self._typing_sent: Dict[str, bool] = {}
+        # user_id -> scheduled flush tasks
+        self._cursor_tasks: Dict[str, asyncio.Task] = {}
+        self._typing_tasks: Dict[str, asyncio.Task] = {}
 
     async def connect(
         self,
@@ -103,6 +123,7 @@ class ConnectionManager:
                 )
 
         del self.user_rooms[user_id]
+        self._clear_pending(user_id)
 
     def get_room_users(self, conversation_id: str) -> List[Dict]:
         """Get list of users in a room."""
@@ -126,16 +147,32 @@ class ConnectionManager:
         exclude_user: Optional[str] = None
     ):
         """Broadcast a message to all users in a room."""
-        if conversation_id not in self.active_connections:
+        room = self.active_connections.get(conversation_id)
+        if not room:
             return
 
-        for user_id, user in self.active_connections[conversation_id].items():
-            if exclude_user and user_id == exclude_user:
-                continue
-            try:
-                await user.websocket.send_text(json.dumps(message))
-            except Exception as e:
-                print(f"Error sending to {user_id}: {e}")
+        # Encode once and send to every recipient concurrently
+        payload = orjson.dumps(message).decode()
+        recipients = [
+            (user_id, user) for user_id, user in room.items()
+            if not (exclude_user and user_id == exclude_user)
+        ]
+        results = await asyncio.gather(
+            *(user.websocket.send_text(payload) for _, user in recipients),
+            return_exceptions=True
+        )
+
+        failed = []
+        for (user_id, user), result in zip(recipients, results):
+            if isinstance(result, Exception):
+                print(f"Error sending to {user_id}: {result}")
+                failed.append((user_id, user))
+
+        # Connections that failed will not recover; disconnect them the
+        # normal way so the room hears user_left and pending flushes stop
+        for user_id, user in failed:
+            if room.get(user_id) is user and self.user_rooms.get(user_id) == conversation_id:
+                await self.disconnect(user_id)
 
     async def send_to_user(self, user_id: str, message: dict):
         """Send a message to a specific user."""
@@ -147,7 +184,7 @@ class ConnectionManager:
             user = self.active_connections[conversation_id].get(user_id)
             if user:
                 try:
-                    await user.websocket.send_text(json.dumps(message))
+                    await user.websocket.send_text(orjson.dumps(message).decode())
                 except Exception as e:
                     print(f"Error sending to {user_id}: {e}")
 
@@ -193,12 +230,63 @@ class ConnectionManager:
             exclude_user=user_id
         )
 
+    def queue_cursor(self, conversation_id: str, user_id: str, position: dict):
+        """Record a cursor move; only the latest per interval is broadcast."""
+        self._pending_cursors[user_id] = position
+        if user_id not in self._cursor_tasks:
+            self._cursor_tasks[user_id] = asyncio.create_task(
+                self._flush_cursor(conversation_id, user_id)
+            )
+
+    def queue_typing(self, conversation_id: str, user_id: str, username: str, is_typing: bool):
+        """Record a typing toggle; repeats of the last sent state are dropped."""
+        self._pending_typing[user_id] = is_typing
+        if user_id not in self._typing_tasks:
+            self._typing_tasks[user_id] = asyncio.create_task(
+                self._flush_typing(conversation_id, user_id, username)
+            )
+
+    async def _flush_cursor(self, conversation_id: str, user_id: str):
+        """Broadcast the latest pending cursor position after the flush interval."""
+        try:
+            await asyncio.sleep(CURSOR_FLUSH_INTERVAL)
+        finally:
+            _release_task(self._cursor_tasks, user_id)
+        position = self._pending_cursors.pop(user_id, None)
+        if position is not None:
+            await self.broadcast_cursor(conversation_id, user_id, position)
+
+    async def _flush_typing(self, conversation_id: str, user_id: str, username: str):
+        """Broadcast the latest pending typing state if it changed."""
+        try:
+            await asyncio.sleep(TYPING_FLUSH_INTERVAL)
+        finally:
+            _release_task(self._typing_tasks, user_id)
+        is_typing = self._pending_typing.pop(user_id, None)
+        if is_typing is not None and self._typing_sent.get(user_id) != is_typing:
+            self._typing_sent[user_id] = is_typing
+            await self.broadcast_typing(conversation_id, user_id, username, is_typing)
+
+    def _clear_pending(self, user_id: str):
+        """Cancel scheduled flushes and forget buffered state for a user."""
+        for tasks in (self._cursor_tasks, self._typing_tasks):
+            task = tasks.pop(user_id, None)
+            if task is not None:
+                task.cancel()
+        self._pending_cursors.pop(user_id, None)
+        self._pending_typing.pop(user_id, None)
+        self._typing_sent.pop(user_id, None)
+
     def get_connection_count(self, conversation_id: str) -> int:
         """Get number of connections in a room."""
         if conversation_id not in self.active_connections:
             return 0
         return len(self.active_connections[conversation_id])
 
+    def get_user_counts(self, conversation_ids: List[str]) -> Dict[str, int]:
+        """Get the number of connections for several rooms at once."""
+        return {cid: self.get_connection_count(cid) for cid in conversation_ids}
+
 
 # Singleton instance
 _connection_manager: Optional[ConnectionManager] = None
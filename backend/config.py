@@ -37,6 +37,12 @@ CHAIRMAN_MODEL = "google/gemini-3-pro-preview"
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Max concurrent in-flight requests per model, shared across all users
+MAX_INFLIGHT_PER_MODEL = int(os.getenv("MAX_INFLIGHT_PER_MODEL", "8"))
+
+# Include tracebacks in streamed error events (development only)
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
 # Data directory for conversation storage
 DATA_DIR = data_path("conversations")
 
@@ -64,6 +70,19 @@ SEMANTIC_CACHE_CONFIG = {
     "ttl_hours": 24,               # Time-to-live in hours
 }
 
+# Read-mostly GET endpoints (constitution, leaderboard, observer stats).
+# Entries are served stale for "stale_seconds" past their TTL while they
+# refresh in the background; writes invalidate their namespace directly.
+RESPONSE_CACHE_CONFIG = {
+    "enabled": True,
+    "ttl_seconds": {
+        "constitution": 300,
+        "predictions": 60,
+        "observer": 30,
+    },
+    "stale_seconds": 60,
+}
+
 # =============================================================================
 # FACTUAL VERIFICATION: Stage 1.5 Contradiction Detection
 # =============================================================================
@@ -145,6 +164,10 @@ MEMORY_CONFIG = {
     "relationships_path": data_path("memory", "relationships.json"),
     "max_memories_per_query": 5,
     "memory_relevance_threshold": 0.3,
+    # Writes are coalesced: saved after this many seconds without changes,
+    # or right away once this many changes are pending
+    "save_debounce_seconds": 0.5,
+    "save_batch_size": 200,
 }
 
 # Specialized councils
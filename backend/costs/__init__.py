@@ -1,12 +1,17 @@
 """Cost tracking module for monitoring API usage."""
 
-from .tracker import CostTracker, UsageData, QueryCost
+from .tracker import (
+    CostTracker, UsageData, QueryCost,
+    acquire_cost_tracker, release_cost_tracker
+)
 from .pricing import get_model_pricing, calculate_cost
 
 __all__ = [
     'CostTracker',
     'UsageData',
     'QueryCost',
+    'acquire_cost_tracker',
+    'release_cost_tracker',
     'get_model_pricing',
     'calculate_cost',
 ]
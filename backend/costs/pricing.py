@@ -100,7 +100,26 @@ def calculate_cost(
     Returns:
         Cost in USD
     """
-    input_price, output_price = get_model_pricing(model)
+    return cost_for_pricing(get_model_pricing(model), input_tokens, output_tokens)
+
+
+def cost_for_pricing(
+    pricing: Tuple[float, float],
+    input_tokens: int,
+    output_tokens: int
+) -> float:
+    """
+    Calculate a cost from an already looked-up pricing pair.
+
+    Args:
+        pricing: (input_price_per_1M, output_price_per_1M) from get_model_pricing
+        input_tokens: Number of input/prompt tokens
+        output_tokens: Number of output/completion tokens
+
+    Returns:
+        Cost in USD
+    """
+    input_price, output_price = pricing
 
     # Convert from per-1M to per-token
     input_cost = (input_tokens / 1_000_000) * input_price
@@ -1,10 +1,11 @@
 """Cost tracker for monitoring API usage during queries."""
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 from datetime import datetime
 
-from .pricing import calculate_cost, format_cost
+from .pricing import calculate_cost, cost_for_pricing, format_cost, get_model_pricing
 
 
 @dataclass
@@ -110,6 +111,13 @@ class CostTracker:
     def __init__(self, query_id: str):
         self.query_cost = QueryCost(query_id=query_id)
 
+    def reset(self, query_id: str):
+        """Reuse this tracker for a new query, keeping its record list."""
+        self.query_cost.query_id = query_id
+        self.query_cost.started_at = datetime.utcnow()
+        self.query_cost.completed_at = None
+        self.query_cost.usage_records.clear()
+
     def add_usage(
         self,
         model: str,
@@ -138,6 +146,38 @@ class CostTracker:
         self.query_cost.usage_records.append(usage)
         return usage
 
+    def add_usage_many(self, records: List[dict], stage: str = "") -> List[UsageData]:
+        """
+        Add usage data from a batch of API calls in one go.
+
+        Pricing is looked up once per distinct model rather than per record.
+
+        Args:
+            records: Usage dicts with 'model', 'input_tokens', 'output_tokens'
+            stage: Stage identifier applied to every record
+
+        Returns:
+            The UsageData records created
+        """
+        pricing: Dict[str, tuple] = {}
+        batch = []
+        for record in records:
+            model = record['model']
+            prices = pricing.get(model)
+            if prices is None:
+                prices = pricing[model] = get_model_pricing(model)
+            input_tokens = record['input_tokens']
+            output_tokens = record['output_tokens']
+            batch.append(UsageData(
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost=cost_for_pricing(prices, input_tokens, output_tokens),
+                stage=stage
+            ))
+        self.query_cost.usage_records.extend(batch)
+        return batch
+
     def complete(self):
         """Mark the query as complete."""
         self.query_cost.completed_at = datetime.utcnow()
@@ -149,3 +189,23 @@ class CostTracker:
     def get_current_total(self) -> float:
         """Get the current total cost."""
         return self.query_cost.total_cost
+
+
+# Pool of idle trackers reused across streamed requests
+_TRACKER_POOL_SIZE = 32
+_tracker_pool: Deque[CostTracker] = deque(maxlen=_TRACKER_POOL_SIZE)
+
+
+def acquire_cost_tracker(query_id: str) -> CostTracker:
+    """Take a tracker from the pool (or allocate one) for a new query."""
+    try:
+        tracker = _tracker_pool.pop()
+    except IndexError:
+        return CostTracker(query_id)
+    tracker.reset(query_id)
+    return tracker
+
+
+def release_cost_tracker(tracker: CostTracker):
+    """Return a tracker to the pool once its summary has been consumed."""
+    _tracker_pool.append(tracker)
@@ -7,6 +7,7 @@ from .config import (
     DEVILS_ADVOCATE_CONFIG, USER_PARTICIPATION_CONFIG
 )
 from .multimodal import prepare_multimodal_messages
+import asyncio
 import re
 
 
@@ -342,11 +343,38 @@ Please respond to these critiques. You may:
 Keep your rebuttal focused and concise. Do not completely rewrite your answer - just address the specific critiques."""
 
 
+def collect_critiques(
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str]
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Extract critiques for every Stage 1 model in one pass.
+
+    The result only depends on Stage 1/2 output, so it can be computed once
+    and reused across debate rounds.
+
+    Args:
+        stage1_results: Original responses from Stage 1
+        stage2_results: Rankings from Stage 2
+        label_to_model: Mapping from labels to model names
+
+    Returns:
+        Dict mapping model name to its list of critiques
+    """
+    return {
+        result['model']: extract_critiques_for_model(result['model'], stage2_results, label_to_model)
+        for result in stage1_results
+        if not result.get('is_user')
+    }
+
+
 async def stage2b_collect_rebuttals(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     stage2_results: List[Dict[str, Any]],
-    label_to_model: Dict[str, str]
+    label_to_model: Dict[str, str],
+    critiques_by_model: Optional[Dict[str, List[Dict[str, str]]]] = None
 ) -> List[Dict[str, Any]]:
     """
     Stage 2B: Collect rebuttals from models whose responses were criticized.
@@ -356,13 +384,16 @@ async def stage2b_collect_rebuttals(
         stage1_results: Original responses from Stage 1
         stage2_results: Rankings from Stage 2
         label_to_model: Mapping from labels to model names
+        critiques_by_model: Optional precomputed output of collect_critiques()
 
     Returns:
         List of rebuttals with model and rebuttal text
     """
-    rebuttals = []
+    if critiques_by_model is None:
+        critiques_by_model = collect_critiques(stage1_results, stage2_results, label_to_model)
 
-    # For each model, extract critiques and request rebuttal
+    # For each model, extract critiques and build a rebuttal request
+    requests = []
     for result in stage1_results:
         model = result['model']
         original_response = result['response']
@@ -371,23 +402,28 @@ async def stage2b_collect_rebuttals(
         if result.get('is_user'):
             continue
 
-        critiques = extract_critiques_for_model(model, stage2_results, label_to_model)
+        critiques = critiques_by_model.get(model, [])
 
         # Only request rebuttal if there are critiques
         if critiques:
             prompt = generate_rebuttal_prompt(
                 model, original_response, critiques, user_query
             )
-            messages = [{"role": "user", "content": prompt}]
+            requests.append((model, len(critiques), [{"role": "user", "content": prompt}]))
 
-            response = await query_model(model, messages)
+    # Query all criticized models in parallel
+    responses = await asyncio.gather(
+        *(query_model(model, messages) for model, _, messages in requests)
+    )
 
-            if response:
-                rebuttals.append({
-                    "model": model,
-                    "critiques_addressed": len(critiques),
-                    "rebuttal": response.get('content', '')
-                })
+    rebuttals = []
+    for (model, critique_count, _), response in zip(requests, responses):
+        if response:
+            rebuttals.append({
+                "model": model,
+                "critiques_addressed": critique_count,
+                "rebuttal": response.get('content', '')
+            })
 
     return rebuttals
 
@@ -736,10 +772,10 @@ def calculate_aggregate_rankings(
     model_positions = defaultdict(list)
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+        # Reuse the ranking parsed in stage 2; parse the text only if missing
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
 
         for position, label in enumerate(parsed_ranking, start=1):
             if label in label_to_model:
@@ -763,6 +799,19 @@ def calculate_aggregate_rankings(
     return aggregate
 
 
+def index_aggregate_rankings(aggregate_rankings: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Build a model -> 1-based rank lookup for calculate_aggregate_rankings() output.
+
+    Args:
+        aggregate_rankings: Sorted aggregate rankings
+
+    Returns:
+        Dict mapping model name to its rank
+    """
+    return {r["model"]: rank for rank, r in enumerate(aggregate_rankings, start=1)}
+
+
 async def generate_conversation_title(user_query: str) -> str:
     """
     Generate a short title for a conversation based on the first user message.
@@ -878,55 +927,66 @@ async def run_full_council_tier2(
     stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results)
     aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
 
-    # Multi-round debate
-    debate_rounds = []
-    all_rebuttals = []
-
-    if enable_debate and DEBATE_CONFIG.get("enabled", True):
-        max_rounds = max_debate_rounds or DEBATE_CONFIG.get("max_rounds", 3)
-
-        for round_num in range(max_rounds):
-            # Check for consensus
-            has_consensus, top_model = check_consensus(stage2_results, label_to_model)
-            if has_consensus:
-                debate_rounds.append({
-                    "round": round_num + 1,
-                    "status": "consensus_reached",
-                    "top_model": top_model
-                })
-                break
-
-            # Collect rebuttals
-            rebuttals = await stage2b_collect_rebuttals(
-                user_query, stage1_results, stage2_results, label_to_model
-            )
+    # Devil's advocate only needs the stage 2 results, so run it alongside
+    # the debate rather than after it
+    devils_task = None
+    if DEVILS_ADVOCATE_CONFIG.get("enabled", True) and aggregate_rankings:
+        # Find the top-ranked model's response
+        top_model = aggregate_rankings[0]["model"]
+        stage1_by_model = {r["model"]: r for r in stage1_results}
+        top_response = stage1_by_model.get(top_model, stage1_results[0])
+        devils_task = asyncio.create_task(stage2_devils_advocate(
+            user_query, top_response, aggregate_rankings
+        ))
 
-            if not rebuttals:
+    try:
+        # Multi-round debate
+        debate_rounds = []
+        all_rebuttals = []
+
+        if enable_debate and DEBATE_CONFIG.get("enabled", True):
+            max_rounds = max_debate_rounds or DEBATE_CONFIG.get("max_rounds", 3)
+
+            # Critiques depend only on stage 1/2 output; extract them once
+            critiques_by_model = collect_critiques(stage1_results, stage2_results, label_to_model)
+
+            for round_num in range(max_rounds):
+                # Check for consensus
+                has_consensus, top_model = check_consensus(stage2_results, label_to_model)
+                if has_consensus:
+                    debate_rounds.append({
+                        "round": round_num + 1,
+                        "status": "consensus_reached",
+                        "top_model": top_model
+                    })
+                    break
+
+                # Collect rebuttals
+                rebuttals = await stage2b_collect_rebuttals(
+                    user_query, stage1_results, stage2_results, label_to_model,
+                    critiques_by_model
+                )
+
+                if not rebuttals:
+                    debate_rounds.append({
+                        "round": round_num + 1,
+                        "status": "no_rebuttals",
+                    })
+                    break
+
+                all_rebuttals.extend(rebuttals)
                 debate_rounds.append({
                     "round": round_num + 1,
-                    "status": "no_rebuttals",
+                    "status": "rebuttals_collected",
+                    "rebuttal_count": len(rebuttals)
                 })
-                break
 
-            all_rebuttals.extend(rebuttals)
-            debate_rounds.append({
-                "round": round_num + 1,
-                "status": "rebuttals_collected",
-                "rebuttal_count": len(rebuttals)
-            })
-
-    # Devil's advocate
-    devils_advocate = None
-    if DEVILS_ADVOCATE_CONFIG.get("enabled", True) and aggregate_rankings:
-        # Find the top-ranked model's response
-        top_model = aggregate_rankings[0]["model"]
-        top_response = next(
-            (r for r in stage1_results if r["model"] == top_model),
-            stage1_results[0]
-        )
-        devils_advocate = await stage2_devils_advocate(
-            user_query, top_response, aggregate_rankings
-        )
+        # Devil's advocate
+        devils_advocate = await devils_task if devils_task else None
+    finally:
+        # Don't leave the devil's advocate call running if the debate failed
+        if devils_task and not devils_task.done():
+            devils_task.cancel()
 
     # Stage 3: Synthesize with all debate context
     stage3_result = await stage3_synthesize_final(
@@ -948,13 +1008,10 @@ async def run_full_council_tier2(
     # Calculate user rank if they participated
     if user_response:
         user_label = USER_PARTICIPATION_CONFIG.get("user_label", "User")
-        user_ranking = next(
-            (r for r in aggregate_rankings if r["model"] == user_label),
-            None
-        )
-        if user_ranking:
-            metadata["user_rank"] = aggregate_rankings.index(user_ranking) + 1
-            metadata["user_average_rank"] = user_ranking["average_rank"]
+        user_rank = index_aggregate_rankings(aggregate_rankings).get(user_label)
+        if user_rank is not None:
+            metadata["user_rank"] = user_rank
+            metadata["user_average_rank"] = aggregate_rankings[user_rank - 1]["average_rank"]
 
     return (
         stage1_results,
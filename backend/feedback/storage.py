@@ -4,7 +4,7 @@ import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from threading import Lock
 
 from ..config import data_path
@@ -52,6 +52,8 @@ class FeedbackStorage:
 
         self.storage_path = data_path("feedback.json")
         self.feedback: List[Feedback] = []
+        # (conversation_id, message_index) -> feedback entries
+        self._by_message: Dict[Tuple[str, int], List[Feedback]] = {}
         self._load()
         self._initialized = True
 
@@ -71,9 +73,16 @@ class FeedbackStorage:
                             comment=item.get('comment'),
                             timestamp=datetime.fromisoformat(item['timestamp'])
                         ))
+                for f in self.feedback:
+                    self._index(f)
         except Exception as e:
             print(f"Failed to load feedback: {e}")
 
+    def _index(self, feedback: Feedback):
+        """Add a feedback entry to the per-message index."""
+        key = (feedback.conversation_id, feedback.message_index)
+        self._by_message.setdefault(key, []).append(feedback)
+
     def _save(self):
         """Save feedback to disk."""
         try:
@@ -105,6 +114,7 @@ class FeedbackStorage:
             comment=comment
         )
         self.feedback.append(feedback)
+        self._index(feedback)
         self._save()
         return feedback
 
@@ -112,6 +122,16 @@ class FeedbackStorage:
         """Get all feedback for a conversation."""
         return [f for f in self.feedback if f.conversation_id == conversation_id]
 
+    def get_feedback_batch(
+        self,
+        pairs: Iterable[Tuple[str, int]]
+    ) -> Dict[Tuple[str, int], List[Feedback]]:
+        """Get feedback for many (conversation_id, message_index) pairs at once."""
+        return {
+            (conversation_id, message_index): self._by_message.get((conversation_id, message_index), [])
+            for conversation_id, message_index in pairs
+        }
+
     def get_feedback_stats(self) -> dict:
         """Get overall feedback statistics."""
         if not self.feedback:
@@ -1,37 +1,46 @@
 """FastAPI backend for LLM Council."""
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect, Header
+from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
-import json
 import asyncio
+import orjson
+import time
+import hashlib
+import secrets
+from collections import OrderedDict
+from tempfile import SpooledTemporaryFile
 
 from . import storage
 from .council import (
     run_full_council, run_full_council_tier2,
     generate_conversation_title, stage1_collect_responses,
     stage2_collect_rankings, stage3_synthesize_final, stage3_synthesize_stream,
-    calculate_aggregate_rankings, stage2b_collect_rebuttals,
+    calculate_aggregate_rankings, index_aggregate_rankings, stage2b_collect_rebuttals, collect_critiques,
     stage2_devils_advocate, check_consensus,
     stage1_single_model, stage1_mini_council
 )
-from .config import COUNCIL_MODELS, DEBATE_CONFIG, SMART_ROUTING_CONFIG, SEMANTIC_CACHE_CONFIG, VERIFICATION_CONFIG
+from .config import COUNCIL_MODELS, DEBATE_CONFIG, SMART_ROUTING_CONFIG, SEMANTIC_CACHE_CONFIG, VERIFICATION_CONFIG, DEBUG
 from .routing import route_query_smart
-from .cache import check_cache, cache_response, get_cache_stats, clear_cache
+from .cache import check_cache, cache_response, get_cache_stats, clear_cache, cached_endpoint, invalidate
 from .verification import run_verification_stage, should_run_verification
 from .api import gateway_router
-from .costs import CostTracker
+from .costs import acquire_cost_tracker, release_cost_tracker
 from .export import export_to_markdown, export_to_html
 from .analytics import get_analytics
-from .feedback import get_feedback_storage
-from .memory import get_memory_store, get_relevant_memories, inject_memory_into_prompt
+from .feedback import FeedbackStorage, get_feedback_storage
+from .memory import MemoryStore, get_memory_store, get_relevant_memories, inject_memory_into_prompt
 from .memory.extraction import extract_memories_from_conversation
-from .multimodal import store_image, get_image, delete_image, cleanup_old_images, prepare_multimodal_messages, is_vision_capable
+from .multimodal import (
+    store_image_stream, get_image, get_image_bytes, get_data_url, delete_image,
+    cleanup_old_images, prepare_multimodal_messages, is_vision_capable
+)
+from .multimodal.storage import MAX_SIZE_BYTES as MAX_IMAGE_BYTES
 from .collaboration import get_connection_manager, get_room_manager
-from .plugins import get_plugin_registry, PluginConfig
+from .plugins import PluginRegistry, get_plugin_registry, PluginConfig
 from .plugins.builtin import BUILTIN_PLUGINS, list_builtin_plugins
 from .routing.ml import get_routing_model, collect_training_sample, train_model, get_training_store
 from .auth import (
@@ -61,7 +70,50 @@ from .observer import (
 )
 from .observer.analyzer import get_analysis_history, get_aggregate_statistics
 
-app = FastAPI(title="LLM Council API")
+app = FastAPI(title="LLM Council API", default_response_class=ORJSONResponse)
+
+# Analytics tracker is a process-wide singleton; resolve it once
+_ANALYTICS = get_analytics()
+
+
+def _sse(event_type: str, **fields) -> bytes:
+    """Encode a Server-Sent Event frame with orjson."""
+    # OPT_NON_STR_KEYS keeps json.dumps' behaviour for int-keyed dicts
+    return b"data: " + orjson.dumps({"type": event_type, **fields}, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+
+# Pre-encoded SSE frames for fixed-shape events (no payload to serialize)
+_SSE_STAGE2_START = b'data: {"type": "stage2_start"}\n\n'
+_SSE_STAGE3_START = b'data: {"type": "stage3_start"}\n\n'
+_SSE_DEVILS_ADVOCATE_START = b'data: {"type": "devils_advocate_start"}\n\n'
+_SSE_COMPLETE = b'data: {"type": "complete"}\n\n'
+
+# Stop reverse proxies (nginx) from buffering the event stream
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _json_response(data: Any) -> Response:
+    """
+    Build a JSON Response directly, skipping FastAPI's jsonable_encoder and re-validation.
+
+    Args:
+        data: A pydantic model (serialized by pydantic-core), already
+            encoded JSON bytes, or plain data for orjson
+
+    Returns:
+        Response carrying the encoded body
+    """
+    if isinstance(data, BaseModel):
+        content = data.model_dump_json()
+    elif isinstance(data, bytes):
+        content = data
+    else:
+        content = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return Response(content=content, media_type="application/json")
 
 # Enable CORS
 import os
@@ -186,7 +238,7 @@ async def update_config(request: UpdateConfigRequest):
     }
 
 
-@app.get("/api/conversations", response_model=List[ConversationMetadata])
+@app.get("/api/conversations", response_model=List[ConversationMetadata], response_class=ORJSONResponse)
 async def list_conversations(user_id: Optional[str] = None):
     """List all conversations (metadata only). Optionally filter by user_id."""
     return storage.list_conversations(user_id=user_id)
@@ -267,13 +319,11 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
+    # Check if conversation exists and whether this is the first message
+    message_count = storage.touch_conversation(conversation_id)
+    if message_count is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    is_first_message = message_count == 0
 
     # Add user message
     storage.add_user_message(conversation_id, request.content)
@@ -305,26 +355,223 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     }
 
 
+async def _serve_cache_hit(
+    conversation_id: str,
+    cached_response,
+    similarity: float,
+    title_task: Optional[asyncio.Task]
+):
+    """Stream a semantic-cache hit and save it as the assistant message."""
+    # Return all cached stages in a single frame
+    cache_hit_full = {
+        'cache_hit': {
+            'similarity': similarity,
+            'original_query': cached_response.query,
+            'routing_tier': cached_response.routing_tier,
+        },
+        'stage1': cached_response.stage1_results,
+        'stage2': cached_response.stage2_results,
+        'metadata': cached_response.metadata,
+        'stage3': cached_response.stage3_result,
+    }
+    yield _sse('cache_hit_full', data=cache_hit_full)
+
+    # Wait for title generation if it was started
+    if title_task:
+        title = await title_task
+        storage.update_conversation_title(conversation_id, title)
+        yield _sse('title_complete', data={'title': title})
+
+    # Save cached response as new message
+    storage.add_assistant_message(
+        conversation_id,
+        cached_response.stage1_results,
+        cached_response.stage2_results,
+        cached_response.stage3_result
+    )
+
+    yield _sse('complete', metadata={'cached': True, 'similarity': similarity})
+
+
+async def _run_council_stream(
+    conversation_id: str,
+    request: SendMessageRequest,
+    title_task: Optional[asyncio.Task],
+    cost_tracker,
+    query_start_time: float
+):
+    """Stream routing and stages 1-3 for a cache miss, then record analytics."""
+    # Smart routing: determine council size based on complexity
+    routing_decision = None
+    if SMART_ROUTING_CONFIG.get("enabled", True):
+        routing_decision = route_query_smart(request.content)
+        yield _sse('routing_decision', data=routing_decision.to_dict())
+
+    # Stage 1: Collect responses based on routing decision
+    if routing_decision and routing_decision.tier == 1:
+        # Single model for simple queries
+        yield _sse('stage1_start', data={'models': routing_decision.models, 'tier': 1})
+        stage1_results, stage1_usage = await stage1_single_model(request.content, routing_decision.models[0], image_ids=request.image_ids)
+    elif routing_decision and routing_decision.tier == 2:
+        # Mini council for medium complexity
+        yield _sse('stage1_start', data={'models': routing_decision.models, 'tier': 2})
+        stage1_results, stage1_usage = await stage1_mini_council(request.content, routing_decision.models, image_ids=request.image_ids)
+    else:
+        # Full council (default)
+        yield _sse('stage1_start', data={'models': COUNCIL_MODELS, 'tier': 3})
+        stage1_results, stage1_usage = await stage1_collect_responses(request.content, image_ids=request.image_ids)
+
+    # Track Stage 1 costs
+    cost_tracker.add_usage_many(stage1_usage, 'stage1')
+
+    yield _sse('stage1_complete', data=stage1_results)
+
+    # Stage 1.5: Factual verification (if enabled and applicable)
+    verification_report = None
+    stage2_verification_context = ""
+    current_tier = routing_decision.tier if routing_decision else 3
+
+    if should_run_verification(stage1_results, current_tier):
+        yield _sse('stage1_5_start', data={'reason': 'Verifying factual claims'})
+        verification_report, stage2_verification_context = await run_verification_stage(
+            stage1_results, request.content
+        )
+        if verification_report:
+            yield _sse('stage1_5_complete', data=verification_report.to_dict())
+        else:
+            yield _sse('stage1_5_complete', data={'skipped': True, 'reason': 'Not enough claims to verify'})
+
+    # Stage 2: Collect rankings (with verification context if available)
+    yield _SSE_STAGE2_START
+    stage2_results, label_to_model, stage2_usage = await stage2_collect_rankings(request.content, stage1_results, stage2_verification_context)
+    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+
+    # Track Stage 2 costs
+    cost_tracker.add_usage_many(stage2_usage, 'stage2')
+
+    # Stage 3: Synthesize final answer with streaming tokens; announce it in
+    # the same write as the stage 2 results
+    yield _sse('stage2_complete', data=stage2_results, metadata={'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings, 'verification_report': verification_report.to_dict() if verification_report else None}) + _SSE_STAGE3_START
+    stage3_result = None
+    async for chunk in stage3_synthesize_stream(request.content, stage1_results, stage2_results):
+        if chunk['type'] == 'token':
+            yield _sse('stage3_token', token=chunk['token'])
+        elif chunk['type'] == 'complete':
+            stage3_result = {'model': chunk['model'], 'response': chunk['response']}
+            # Track Stage 3 costs (estimated from streaming)
+            usage = chunk.get('usage', {})
+            if usage:
+                cost_tracker.add_usage(
+                    chunk['model'],
+                    usage.get('input_tokens', 0),
+                    usage.get('output_tokens', 0),
+                    'stage3'
+                )
+            yield _sse('stage3_complete', data=stage3_result)
+        elif chunk['type'] == 'error':
+            stage3_result = {'model': chunk['model'], 'response': chunk['response']}
+            yield _sse('stage3_complete', data=stage3_result)
+
+    # Wait for title generation if it was started
+    if title_task:
+        title = await title_task
+        storage.update_conversation_title(conversation_id, title)
+        yield _sse('title_complete', data={'title': title})
+
+    # Save complete assistant message
+    storage.add_assistant_message(
+        conversation_id,
+        stage1_results,
+        stage2_results,
+        stage3_result
+    )
+
+    # Cache the response for future similar queries
+    if SEMANTIC_CACHE_CONFIG.get("enabled", True):
+        cache_response(
+            query=request.content,
+            stage1_results=stage1_results,
+            stage2_results=stage2_results,
+            stage3_result=stage3_result,
+            metadata={'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings},
+            routing_tier=current_tier
+        )
+
+    # Complete cost tracking and emit summary
+    cost_tracker.complete()
+    cost_summary = cost_tracker.get_summary()
+    yield _sse('cost_summary', data=cost_summary)
+
+    _record_analytics_tail(
+        conversation_id, cost_tracker, cost_summary,
+        stage1_results, aggregate_rankings, current_tier, query_start_time
+    )
+
+    # Send completion event
+    yield _SSE_COMPLETE
+
+
+def _record_analytics_tail(
+    conversation_id: str,
+    cost_tracker,
+    cost_summary: Dict[str, Any],
+    stage1_results: List[Dict[str, Any]],
+    aggregate_rankings: List[Dict[str, Any]],
+    tier: int,
+    query_start_time: float
+):
+    """Record model usage, rankings and the query itself in analytics."""
+    analytics = _ANALYTICS
+    query_duration = (time.monotonic() - query_start_time) * 1000
+    models_used = [r['model'] for r in stage1_results] if stage1_results else []
+
+    # Record model usage from cost tracker
+    for usage in cost_tracker.query_cost.usage_records:
+        analytics.record_model_usage(
+            model=usage.model,
+            tokens_in=usage.input_tokens,
+            tokens_out=usage.output_tokens,
+            cost=usage.cost
+        )
+
+    # Record rankings if available
+    if aggregate_rankings:
+        for idx, rank_item in enumerate(aggregate_rankings, 1):
+            analytics.record_ranking(
+                model=rank_item['model'],
+                rank=idx,
+                total_models=len(aggregate_rankings)
+            )
+
+    # Record query
+    analytics.record_query(
+        query_id=conversation_id,
+        tier=tier,
+        models_used=models_used,
+        total_cost=cost_summary.get('total_cost', 0),
+        total_tokens=cost_summary.get('total_tokens', 0),
+        duration_ms=query_duration,
+        cache_hit=False
+    )
+
+
 @app.post("/api/conversations/{conversation_id}/message/stream")
 async def send_message_stream(conversation_id: str, request: SendMessageRequest):
     """
     Send a message and stream the 3-stage council process.
     Returns Server-Sent Events as each stage completes.
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
+    # Check if conversation exists and whether this is the first message
+    message_count = storage.touch_conversation(conversation_id)
+    if message_count is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    is_first_message = message_count == 0
 
     async def event_generator():
+        # Initialize cost tracker for this query (pooled across requests)
+        cost_tracker = acquire_cost_tracker(conversation_id)
         try:
-            # Initialize cost tracker for this query
-            cost_tracker = CostTracker(conversation_id)
-            query_start_time = asyncio.get_event_loop().time()
-            analytics = get_analytics()
+            query_start_time = time.monotonic()
 
             # Add user message
             storage.add_user_message(conversation_id, request.content)
@@ -334,196 +581,27 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
             if is_first_message:
                 title_task = asyncio.create_task(generate_conversation_title(request.content))
 
-            # Check semantic cache first
+            # Check semantic cache first, then pick the warm or cold path
             cache_result = check_cache(request.content) if SEMANTIC_CACHE_CONFIG.get("enabled", True) else None
             if cache_result:
                 cached_response, similarity = cache_result
-                yield f"data: {json.dumps({'type': 'cache_hit', 'data': {'similarity': similarity, 'original_query': cached_response.query, 'routing_tier': cached_response.routing_tier}})}\n\n"
-
-                # Return cached results
-                yield f"data: {json.dumps({'type': 'stage1_complete', 'data': cached_response.stage1_results})}\n\n"
-                yield f"data: {json.dumps({'type': 'stage2_complete', 'data': cached_response.stage2_results, 'metadata': cached_response.metadata})}\n\n"
-                yield f"data: {json.dumps({'type': 'stage3_complete', 'data': cached_response.stage3_result})}\n\n"
-
-                # Wait for title generation if it was started
-                if title_task:
-                    title = await title_task
-                    storage.update_conversation_title(conversation_id, title)
-                    yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
-
-                # Save cached response as new message
-                storage.add_assistant_message(
-                    conversation_id,
-                    cached_response.stage1_results,
-                    cached_response.stage2_results,
-                    cached_response.stage3_result
-                )
-
-                yield f"data: {json.dumps({'type': 'complete', 'metadata': {'cached': True, 'similarity': similarity}})}\n\n"
-                return
-
-            # Smart routing: determine council size based on complexity
-            routing_decision = None
-            if SMART_ROUTING_CONFIG.get("enabled", True):
-                routing_decision = route_query_smart(request.content)
-                yield f"data: {json.dumps({'type': 'routing_decision', 'data': routing_decision.to_dict()})}\n\n"
-
-            # Stage 1: Collect responses based on routing decision
-            if routing_decision and routing_decision.tier == 1:
-                # Single model for simple queries
-                yield f"data: {json.dumps({'type': 'stage1_start', 'data': {'models': routing_decision.models, 'tier': 1}})}\n\n"
-                stage1_results, stage1_usage = await stage1_single_model(request.content, routing_decision.models[0], image_ids=request.image_ids)
-            elif routing_decision and routing_decision.tier == 2:
-                # Mini council for medium complexity
-                yield f"data: {json.dumps({'type': 'stage1_start', 'data': {'models': routing_decision.models, 'tier': 2}})}\n\n"
-                stage1_results, stage1_usage = await stage1_mini_council(request.content, routing_decision.models, image_ids=request.image_ids)
+                frames = _serve_cache_hit(conversation_id, cached_response, similarity, title_task)
             else:
-                # Full council (default)
-                yield f"data: {json.dumps({'type': 'stage1_start', 'data': {'models': COUNCIL_MODELS, 'tier': 3}})}\n\n"
-                stage1_results, stage1_usage = await stage1_collect_responses(request.content, image_ids=request.image_ids)
-
-            # Track Stage 1 costs
-            for usage in stage1_usage:
-                cost_tracker.add_usage(
-                    usage['model'],
-                    usage['input_tokens'],
-                    usage['output_tokens'],
-                    'stage1'
-                )
-
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
+                frames = _run_council_stream(conversation_id, request, title_task, cost_tracker, query_start_time)
 
-            # Stage 1.5: Factual verification (if enabled and applicable)
-            verification_report = None
-            stage2_verification_context = ""
-            current_tier = routing_decision.tier if routing_decision else 3
-
-            if should_run_verification(stage1_results, current_tier):
-                yield f"data: {json.dumps({'type': 'stage1_5_start', 'data': {'reason': 'Verifying factual claims'}})}\n\n"
-                verification_report, stage2_verification_context = await run_verification_stage(
-                    stage1_results, request.content
-                )
-                if verification_report:
-                    yield f"data: {json.dumps({'type': 'stage1_5_complete', 'data': verification_report.to_dict()})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'type': 'stage1_5_complete', 'data': {'skipped': True, 'reason': 'Not enough claims to verify'}})}\n\n"
-
-            # Stage 2: Collect rankings (with verification context if available)
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model, stage2_usage = await stage2_collect_rankings(request.content, stage1_results, stage2_verification_context)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-
-            # Track Stage 2 costs
-            for usage in stage2_usage:
-                cost_tracker.add_usage(
-                    usage['model'],
-                    usage['input_tokens'],
-                    usage['output_tokens'],
-                    'stage2'
-                )
-
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings, 'verification_report': verification_report.to_dict() if verification_report else None}})}\n\n"
-
-            # Stage 3: Synthesize final answer with streaming tokens
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = None
-            async for chunk in stage3_synthesize_stream(request.content, stage1_results, stage2_results):
-                if chunk['type'] == 'token':
-                    yield f"data: {json.dumps({'type': 'stage3_token', 'token': chunk['token']})}\n\n"
-                elif chunk['type'] == 'complete':
-                    stage3_result = {'model': chunk['model'], 'response': chunk['response']}
-                    # Track Stage 3 costs (estimated from streaming)
-                    usage = chunk.get('usage', {})
-                    if usage:
-                        cost_tracker.add_usage(
-                            chunk['model'],
-                            usage.get('input_tokens', 0),
-                            usage.get('output_tokens', 0),
-                            'stage3'
-                        )
-                    yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-                elif chunk['type'] == 'error':
-                    stage3_result = {'model': chunk['model'], 'response': chunk['response']}
-                    yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-
-            # Wait for title generation if it was started
-            if title_task:
-                title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
-
-            # Save complete assistant message
-            storage.add_assistant_message(
-                conversation_id,
-                stage1_results,
-                stage2_results,
-                stage3_result
-            )
-
-            # Cache the response for future similar queries
-            if SEMANTIC_CACHE_CONFIG.get("enabled", True):
-                cache_response(
-                    query=request.content,
-                    stage1_results=stage1_results,
-                    stage2_results=stage2_results,
-                    stage3_result=stage3_result,
-                    metadata={'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings},
-                    routing_tier=routing_decision.tier if routing_decision else 3
-                )
-
-            # Complete cost tracking and emit summary
-            cost_tracker.complete()
-            cost_summary = cost_tracker.get_summary()
-            yield f"data: {json.dumps({'type': 'cost_summary', 'data': cost_summary})}\n\n"
-
-            # Record analytics
-            query_duration = (asyncio.get_event_loop().time() - query_start_time) * 1000
-            models_used = [r['model'] for r in stage1_results] if stage1_results else []
-            current_tier = routing_decision.tier if routing_decision else 3
-
-            # Record model usage from cost tracker
-            for usage in cost_tracker.query_cost.usage_records:
-                analytics.record_model_usage(
-                    model=usage.model,
-                    tokens_in=usage.input_tokens,
-                    tokens_out=usage.output_tokens,
-                    cost=usage.cost
-                )
-
-            # Record rankings if available
-            if aggregate_rankings:
-                for idx, rank_item in enumerate(aggregate_rankings, 1):
-                    analytics.record_ranking(
-                        model=rank_item['model'],
-                        rank=idx,
-                        total_models=len(aggregate_rankings)
-                    )
-
-            # Record query
-            analytics.record_query(
-                query_id=conversation_id,
-                tier=current_tier,
-                models_used=models_used,
-                total_cost=cost_summary.get('total_cost', 0),
-                total_tokens=cost_summary.get('total_tokens', 0),
-                duration_ms=query_duration,
-                cache_hit=False
-            )
-
-            # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            async for frame in frames:
+                yield frame
 
         except Exception as e:
             # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse('error', message=str(e))
+        finally:
+            release_cost_tracker(cost_tracker)
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers=_SSE_HEADERS
     )
 
 
@@ -600,7 +678,11 @@ class FeedbackRequest(BaseModel):
 
 
 @app.post("/api/conversations/{conversation_id}/feedback")
-async def submit_feedback(conversation_id: str, request: FeedbackRequest):
+async def submit_feedback(
+    conversation_id: str,
+    request: FeedbackRequest,
+    feedback_storage: FeedbackStorage = Depends(get_feedback_storage)
+):
     """Submit feedback for a response."""
     # Verify conversation exists
     conversation = storage.get_conversation(conversation_id)
@@ -610,7 +692,6 @@ async def submit_feedback(conversation_id: str, request: FeedbackRequest):
     if request.message_index >= len(conversation.get('messages', [])):
         raise HTTPException(status_code=400, detail="Invalid message index")
 
-    feedback_storage = get_feedback_storage()
     feedback = feedback_storage.add_feedback(
         conversation_id=conversation_id,
         message_index=request.message_index,
@@ -622,17 +703,38 @@ async def submit_feedback(conversation_id: str, request: FeedbackRequest):
 
 
 @app.get("/api/conversations/{conversation_id}/feedback")
-async def get_conversation_feedback(conversation_id: str):
+async def get_conversation_feedback(
+    conversation_id: str,
+    feedback_storage: FeedbackStorage = Depends(get_feedback_storage)
+):
     """Get all feedback for a conversation."""
-    feedback_storage = get_feedback_storage()
     feedback = feedback_storage.get_feedback_for_conversation(conversation_id)
     return {"feedback": [f.to_dict() for f in feedback]}
 
 
+class BatchFeedbackRequest(BaseModel):
+    """Request to fetch feedback for many messages at once."""
+    items: List[Tuple[str, int]]
+
+
+@app.post("/api/feedback/batch")
+async def get_feedback_batch(
+    request: BatchFeedbackRequest,
+    feedback_storage: FeedbackStorage = Depends(get_feedback_storage)
+):
+    """Get feedback for a list of (conversation_id, message_index) pairs."""
+    batch = feedback_storage.get_feedback_batch(request.items)
+    return {
+        "feedback": {
+            f"{conversation_id}:{message_index}": [f.to_dict() for f in matches]
+            for (conversation_id, message_index), matches in batch.items()
+        }
+    }
+
+
 @app.get("/api/feedback/stats")
-async def get_feedback_stats():
+async def get_feedback_stats(feedback_storage: FeedbackStorage = Depends(get_feedback_storage)):
     """Get overall feedback statistics."""
-    feedback_storage = get_feedback_storage()
     return feedback_storage.get_feedback_stats()
 
 
@@ -660,47 +762,44 @@ class UpdateMemoryRequest(BaseModel):
     importance: Optional[float] = None
 
 
-@app.get("/api/memories")
+class MemoryOut(BaseModel):
+    """A memory as returned by the API, read straight off the stored Memory."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: str
+    content: str
+    created_at: str
+    tags: List[str]
+    importance: float
+    access_count: int
+    related_models: List[str]
+
+
+class MemoryListResponse(BaseModel):
+    """A page of memories plus the store total."""
+    memories: List[MemoryOut]
+    total: int
+
+
+@app.get("/api/memories", response_model=MemoryListResponse)
 async def list_memories(
     memory_type: Optional[str] = None,
     tag: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    store: MemoryStore = Depends(get_memory_store)
 ):
     """List all memories with optional filtering."""
-    store = get_memory_store()
 
-    if memory_type:
-        memories = store.get_memories_by_type(memory_type)
-    elif tag:
-        memories = store.get_memories_by_tag(tag)
-    else:
-        memories = store.get_all_memories()
+    # Newest first, limited without sorting the whole candidate set
+    memories = store.get_recent_memories(limit=limit, memory_type=memory_type, tag=tag)
 
-    # Sort by created_at descending and limit
-    memories = sorted(memories, key=lambda m: m.created_at, reverse=True)[:limit]
-
-    return {
-        "memories": [
-            {
-                "id": m.id,
-                "type": m.type,
-                "content": m.content,
-                "created_at": m.created_at,
-                "tags": m.tags,
-                "importance": m.importance,
-                "access_count": m.access_count,
-                "related_models": m.related_models,
-            }
-            for m in memories
-        ],
-        "total": len(store.get_all_memories())
-    }
+    return _json_response(MemoryListResponse(memories=memories, total=store.count()))
 
 
 @app.post("/api/memories")
-async def add_memory(request: AddMemoryRequest):
+async def add_memory(request: AddMemoryRequest, store: MemoryStore = Depends(get_memory_store)):
     """Add a new memory."""
-    store = get_memory_store()
     memory = store.add_memory(
         content=request.content,
         memory_type=request.memory_type,
@@ -717,29 +816,22 @@ async def add_memory(request: AddMemoryRequest):
     }
 
 
-@app.get("/api/memories/{memory_id}")
-async def get_memory(memory_id: str):
+@app.get("/api/memories/{memory_id}", response_model=MemoryOut)
+async def get_memory(memory_id: str, store: MemoryStore = Depends(get_memory_store)):
     """Get a specific memory."""
-    store = get_memory_store()
     memory = store.get_memory(memory_id)
     if memory is None:
         raise HTTPException(status_code=404, detail="Memory not found")
-    return {
-        "id": memory.id,
-        "type": memory.type,
-        "content": memory.content,
-        "created_at": memory.created_at,
-        "tags": memory.tags,
-        "importance": memory.importance,
-        "access_count": memory.access_count,
-        "related_models": memory.related_models,
-    }
+    return _json_response(MemoryOut.model_validate(memory))
 
 
 @app.put("/api/memories/{memory_id}")
-async def update_memory(memory_id: str, request: UpdateMemoryRequest):
+async def update_memory(
+    memory_id: str,
+    request: UpdateMemoryRequest,
+    store: MemoryStore = Depends(get_memory_store)
+):
     """Update a memory."""
-    store = get_memory_store()
 
     updates = {}
     if request.content is not None:
@@ -765,9 +857,8 @@ async def update_memory(memory_id: str, request: UpdateMemoryRequest):
 
 
 @app.delete("/api/memories/{memory_id}")
-async def delete_memory(memory_id: str):
+async def delete_memory(memory_id: str, store: MemoryStore = Depends(get_memory_store)):
     """Delete a memory."""
-    store = get_memory_store()
     deleted = store.delete_memory(memory_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Memory not found")
@@ -802,19 +893,20 @@ async def extract_memories_from_conv(conversation_id: str):
 
     # Find the most recent assistant message with all stages
     messages = conversation.get("messages", [])
-    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
 
-    if not assistant_messages:
-        return {"conversation_id": conversation_id, "extracted_count": 0, "memories": []}
-
-    # Get the last assistant message and the preceding user message
-    last_assistant = assistant_messages[-1]
+    # Walk back to the last assistant message and the user message before it
+    last_assistant = None
     user_query = ""
-    for i, m in enumerate(messages):
-        if m == last_assistant and i > 0:
-            user_query = messages[i - 1].get("content", "")
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].get("role") == "assistant":
+            last_assistant = messages[i]
+            if i > 0:
+                user_query = messages[i - 1].get("content", "")
             break
 
+    if last_assistant is None:
+        return {"conversation_id": conversation_id, "extracted_count": 0, "memories": []}
+
     if not user_query or not last_assistant.get("stage3"):
         return {"conversation_id": conversation_id, "extracted_count": 0, "memories": []}
 
@@ -844,25 +936,18 @@ async def extract_memories_from_conv(conversation_id: str):
 
 
 @app.get("/api/memories/stats")
-async def get_memory_stats():
+async def get_memory_stats(store: MemoryStore = Depends(get_memory_store)):
     """Get memory statistics."""
-    store = get_memory_store()
-    all_memories = store.get_all_memories()
-
-    # Count by type
-    type_counts = {}
-    for m in all_memories:
-        type_counts[m.type] = type_counts.get(m.type, 0) + 1
 
     # Get most accessed
-    most_accessed = sorted(all_memories, key=lambda m: m.access_count, reverse=True)[:5]
+    most_accessed = store.get_top_memories("access_count", 5)
 
     # Get highest importance
-    highest_importance = sorted(all_memories, key=lambda m: m.importance, reverse=True)[:5]
+    highest_importance = store.get_top_memories("importance", 5)
 
     return {
-        "total_memories": len(all_memories),
-        "by_type": type_counts,
+        "total_memories": store.count(),
+        "by_type": store.count_by_type(),
         "most_accessed": [
             {"id": m.id, "content": m.content[:100], "access_count": m.access_count}
             for m in most_accessed
@@ -876,25 +961,42 @@ async def get_memory_stats():
 
 # ==================== Image Upload API ====================
 
+UPLOAD_CHUNK_BYTES = 64 * 1024
+UPLOAD_SPOOL_BYTES = 2 * 1024 * 1024  # Spill to disk past this size
+
+
 @app.post("/api/images/upload")
 async def upload_image(file: UploadFile = File(...)):
     """Upload an image for use in multimodal queries."""
-    # Read file content
-    content = await file.read()
-
-    # Store the image
-    stored = store_image(
-        content=content,
-        filename=file.filename or "image",
-        content_type=file.content_type or "image/jpeg"
+    invalid = HTTPException(
+        status_code=400,
+        detail="Invalid image. Max size: 10MB. Allowed types: jpeg, png, gif, webp"
     )
 
-    if stored is None:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid image. Max size: 10MB. Allowed types: jpeg, png, gif, webp"
+    # Stream the upload into a spooled file, rejecting it as soon as it
+    # crosses the size limit rather than buffering the whole body first
+    size = 0
+    digest = hashlib.blake2b()
+    with SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as spool:
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > MAX_IMAGE_BYTES:
+                raise invalid
+            digest.update(chunk)
+            spool.write(chunk)
+
+        stored = await asyncio.to_thread(
+            store_image_stream,
+            spool,
+            size,
+            digest.hexdigest(),
+            file.filename or "image",
+            file.content_type or "image/jpeg"
         )
 
+    if stored is None:
+        raise invalid
+
     return {
         "id": stored.id,
         "filename": stored.filename,
@@ -938,19 +1040,39 @@ async def cleanup_images():
 @app.get("/api/images/{image_id}/thumbnail")
 async def get_image_thumbnail(image_id: str):
     """Get image as base64 for preview."""
-    image = get_image(image_id)
+    image = await asyncio.to_thread(get_image, image_id)
     if image is None:
         raise HTTPException(status_code=404, detail="Image not found")
 
+    data_url = await asyncio.to_thread(get_data_url, image)
+    if data_url is None:
+        raise HTTPException(status_code=404, detail="Image data not found")
+
     return {
         "id": image.id,
         "content_type": image.content_type,
-        "data_url": f"data:{image.content_type};base64,{image.base64_data}"
+        "data_url": data_url
     }
 
 
+@app.get("/api/images/{image_id}/raw")
+async def get_image_raw(image_id: str):
+    """Get the image itself as binary, e.g. for use as an <img> src."""
+    image = await asyncio.to_thread(get_image, image_id)
+    if image is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    content = await asyncio.to_thread(get_image_bytes, image)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Image data not found")
+    return Response(content=content, media_type=image.content_type)
+
+
 # ==================== Real-time Collaboration API ====================
 
+INVITE_CODE_NBYTES = 8
+
+
 class CreateRoomRequest(BaseModel):
     """Request to create a collaborative room."""
     name: str
@@ -979,8 +1101,7 @@ async def create_collaboration_room(conversation_id: str, request: CreateRoomReq
         }
 
     # Generate invite code
-    import secrets
-    invite_code = secrets.token_urlsafe(8)
+    invite_code = secrets.token_urlsafe(INVITE_CODE_NBYTES)
 
     room = room_manager.create_room(
         room_id=str(uuid.uuid4()),
@@ -1053,17 +1174,18 @@ async def list_public_rooms():
     connection_manager = get_connection_manager()
 
     rooms = room_manager.get_public_rooms()
-    result = []
+    user_counts = connection_manager.get_user_counts([room.conversation_id for room in rooms])
 
-    for room in rooms:
-        users = connection_manager.get_room_users(room.conversation_id)
-        result.append({
+    result = [
+        {
             "id": room.id,
             "name": room.name,
             "conversation_id": room.conversation_id,
-            "current_users": len(users),
+            "current_users": user_counts[room.conversation_id],
             "max_users": room.max_users
-        })
+        }
+        for room in rooms
+    ]
 
     return {"rooms": result}
 
@@ -1085,7 +1207,7 @@ async def websocket_collaborate(websocket: WebSocket, conversation_id: str):
             message_type = data.get("type")
 
             if message_type == "typing":
-                await connection_manager.broadcast_typing(
+                connection_manager.queue_typing(
                     conversation_id,
                     user_id,
                     username,
@@ -1093,7 +1215,7 @@ async def websocket_collaborate(websocket: WebSocket, conversation_id: str):
                 )
 
             elif message_type == "cursor":
-                await connection_manager.broadcast_cursor(
+                connection_manager.queue_cursor(
                     conversation_id,
                     user_id,
                     data.get("position", {})
@@ -1142,9 +1264,8 @@ class PluginSettingsRequest(BaseModel):
 
 
 @app.get("/api/plugins")
-async def list_plugins():
+async def list_plugins(registry: PluginRegistry = Depends(get_plugin_registry)):
     """List all registered plugins."""
-    registry = get_plugin_registry()
     return {
         "plugins": registry.list_plugins(),
         "available_builtin": list_builtin_plugins()
@@ -1152,9 +1273,8 @@ async def list_plugins():
 
 
 @app.post("/api/plugins/{plugin_name}/enable")
-async def enable_plugin(plugin_name: str):
+async def enable_plugin(plugin_name: str, registry: PluginRegistry = Depends(get_plugin_registry)):
     """Enable a plugin."""
-    registry = get_plugin_registry()
 
     # If plugin not registered, try to register from builtin
     if not registry.get_plugin(plugin_name):
@@ -1170,18 +1290,19 @@ async def enable_plugin(plugin_name: str):
 
 
 @app.post("/api/plugins/{plugin_name}/disable")
-async def disable_plugin(plugin_name: str):
+async def disable_plugin(plugin_name: str, registry: PluginRegistry = Depends(get_plugin_registry)):
     """Disable a plugin."""
-    registry = get_plugin_registry()
     if registry.disable_plugin(plugin_name):
         return {"status": "disabled", "plugin": plugin_name}
     raise HTTPException(status_code=404, detail="Plugin not found")
 
 
 @app.get("/api/plugins/{plugin_name}")
-async def get_plugin_info(plugin_name: str):
+async def get_plugin_info(
+    plugin_name: str,
+    registry: PluginRegistry = Depends(get_plugin_registry)
+):
     """Get plugin information."""
-    registry = get_plugin_registry()
     plugin = registry.get_plugin(plugin_name)
     if plugin:
         return plugin.get_info()
@@ -1189,9 +1310,12 @@ async def get_plugin_info(plugin_name: str):
 
 
 @app.put("/api/plugins/{plugin_name}/settings")
-async def update_plugin_settings(plugin_name: str, request: PluginSettingsRequest):
+async def update_plugin_settings(
+    plugin_name: str,
+    request: PluginSettingsRequest,
+    registry: PluginRegistry = Depends(get_plugin_registry)
+):
     """Update plugin settings."""
-    registry = get_plugin_registry()
     if registry.update_settings(plugin_name, request.settings):
         plugin = registry.get_plugin(plugin_name)
         return {"status": "updated", "plugin": plugin.get_info()}
@@ -1199,21 +1323,25 @@ async def update_plugin_settings(plugin_name: str, request: PluginSettingsReques
 
 
 @app.post("/api/plugins/builtin/{plugin_name}/register")
-async def register_builtin_plugin(plugin_name: str):
+async def register_builtin_plugin(
+    plugin_name: str,
+    registry: PluginRegistry = Depends(get_plugin_registry)
+):
     """Register a built-in plugin."""
     plugin_class = BUILTIN_PLUGINS.get(plugin_name)
     if not plugin_class:
         raise HTTPException(status_code=404, detail="Built-in plugin not found")
 
-    registry = get_plugin_registry()
     plugin = registry.register(plugin_class)
     return {"status": "registered", "plugin": plugin.get_info()}
 
 
 @app.delete("/api/plugins/{plugin_name}")
-async def unregister_plugin(plugin_name: str):
+async def unregister_plugin(
+    plugin_name: str,
+    registry: PluginRegistry = Depends(get_plugin_registry)
+):
     """Unregister a plugin."""
-    registry = get_plugin_registry()
     if registry.unregister(plugin_name):
         return {"status": "unregistered", "plugin": plugin_name}
     raise HTTPException(status_code=404, detail="Plugin not found")
@@ -1290,10 +1418,10 @@ async def get_routing_model_info():
 
 
 @app.get("/api/routing/training-data")
-async def get_training_data(limit: int = 50):
-    """Get recent training samples."""
+async def get_training_data(limit: int = 50, before: Optional[int] = None):
+    """Get recent training samples, paging back in time via the `before` cursor."""
     store = get_training_store()
-    samples = store.get_samples(limit=limit)
+    samples, next_cursor = store.get_samples_page(before=before, limit=limit)
 
     return {
         "samples": [
@@ -1306,7 +1434,8 @@ async def get_training_data(limit: int = 50):
             }
             for s in samples
         ],
-        "total": len(store.samples),
+        "total": store.count(),
+        "next_cursor": next_cursor,
     }
 
 
@@ -1524,13 +1653,11 @@ async def send_message_stream_v2(conversation_id: str, request: SendMessageV2Req
     Send a message with Tier 2 features: multi-round debate, devil's advocate, user participation.
     Returns Server-Sent Events as each stage completes.
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
+    # Check if conversation exists and whether this is the first message
+    message_count = storage.touch_conversation(conversation_id)
+    if message_count is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    is_first_message = message_count == 0
 
     async def event_generator():
         try:
@@ -1545,122 +1672,134 @@ async def send_message_stream_v2(conversation_id: str, request: SendMessageV2Req
             # Determine models to use
             models = COUNCIL_MODELS.copy()
             if request.user_response:
-                yield f"data: {json.dumps({'type': 'user_participating', 'data': {'enabled': True}})}\n\n"
+                yield _sse('user_participating', data={'enabled': True})
 
             # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start', 'data': {'models': models}})}\n\n"
+            yield _sse('stage1_start', data={'models': models})
 
             if request.user_response:
                 from .council import stage1_with_user_response
                 stage1_results = await stage1_with_user_response(request.content, request.user_response)
             else:
                 stage1_results = await stage1_collect_responses(request.content)
+            stage1_by_model = {r["model"]: r for r in stage1_results}
 
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
+            yield _sse('stage1_complete', data=stage1_results)
 
             # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
+            yield _SSE_STAGE2_START
             stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results)
             aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Multi-round debate (Tier 2)
-            all_rebuttals = []
-            debate_rounds = []
-
-            if request.enable_debate and DEBATE_CONFIG.get("enabled", True):
-                max_rounds = request.max_debate_rounds or DEBATE_CONFIG.get("max_rounds", 3)
-
-                for round_num in range(max_rounds):
-                    # Check for consensus
-                    has_consensus, top_model = check_consensus(stage2_results, label_to_model)
-                    if has_consensus:
-                        yield f"data: {json.dumps({'type': 'consensus_reached', 'data': {'round': round_num + 1, 'top_model': top_model}})}\n\n"
-                        debate_rounds.append({
-                            "round": round_num + 1,
-                            "status": "consensus_reached",
-                            "top_model": top_model
-                        })
-                        break
+            yield _sse('stage2_complete', data=stage2_results, metadata={'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings})
 
-                    # Signal rebuttal round start
-                    yield f"data: {json.dumps({'type': 'rebuttal_round_start', 'data': {'round': round_num + 1}})}\n\n"
-
-                    # Collect rebuttals
-                    rebuttals = await stage2b_collect_rebuttals(
-                        request.content, stage1_results, stage2_results, label_to_model
-                    )
+            # Devil's advocate only needs the stage 2 results; start it now so
+            # it runs alongside the debate rounds
+            devils_task = None
+            if aggregate_rankings:
+                top_model = aggregate_rankings[0]["model"]
+                top_response = stage1_by_model.get(top_model, stage1_results[0])
+                devils_task = asyncio.create_task(stage2_devils_advocate(
+                    request.content, top_response, aggregate_rankings
+                ))
+
+            try:
+                # Multi-round debate (Tier 2)
+                all_rebuttals = []
+                debate_rounds = []
+
+                if request.enable_debate and DEBATE_CONFIG.get("enabled", True):
+                    max_rounds = request.max_debate_rounds or DEBATE_CONFIG.get("max_rounds", 3)
+
+                    # Critiques depend only on stage 1/2 output; extract them once
+                    critiques_by_model = collect_critiques(stage1_results, stage2_results, label_to_model)
+
+                    for round_num in range(max_rounds):
+                        # Check for consensus
+                        has_consensus, top_model = check_consensus(stage2_results, label_to_model)
+                        if has_consensus:
+                            yield _sse('consensus_reached', data={'round': round_num + 1, 'top_model': top_model})
+                            debate_rounds.append({
+                                "round": round_num + 1,
+                                "status": "consensus_reached",
+                                "top_model": top_model
+                            })
+                            break
+
+                        # Signal rebuttal round start
+                        yield _sse('rebuttal_round_start', data={'round': round_num + 1})
+
+                        # Collect rebuttals
+                        rebuttals = await stage2b_collect_rebuttals(
+                            request.content, stage1_results, stage2_results, label_to_model,
+                            critiques_by_model
+                        )
 
-                    if not rebuttals:
-                        yield f"data: {json.dumps({'type': 'rebuttal_round_complete', 'data': {'round': round_num + 1, 'status': 'no_rebuttals'}})}\n\n"
+                        if not rebuttals:
+                            yield _sse('rebuttal_round_complete', data={'round': round_num + 1, 'status': 'no_rebuttals'})
+                            debate_rounds.append({
+                                "round": round_num + 1,
+                                "status": "no_rebuttals"
+                            })
+                            break
+
+                        all_rebuttals.extend(rebuttals)
+
+                        # Send each rebuttal and the round summary in a single write
+                        yield b"".join([
+                            *(_sse('rebuttal_complete', data=rebuttal) for rebuttal in rebuttals),
+                            _sse('rebuttal_round_complete', data={'round': round_num + 1, 'rebuttal_count': len(rebuttals)}),
+                        ])
                         debate_rounds.append({
                             "round": round_num + 1,
-                            "status": "no_rebuttals"
+                            "status": "rebuttals_collected",
+                            "rebuttal_count": len(rebuttals)
                         })
-                        break
-
-                    all_rebuttals.extend(rebuttals)
-
-                    # Send each rebuttal
-                    for rebuttal in rebuttals:
-                        yield f"data: {json.dumps({'type': 'rebuttal_complete', 'data': rebuttal})}\n\n"
 
-                    yield f"data: {json.dumps({'type': 'rebuttal_round_complete', 'data': {'round': round_num + 1, 'rebuttal_count': len(rebuttals)}})}\n\n"
-                    debate_rounds.append({
-                        "round": round_num + 1,
-                        "status": "rebuttals_collected",
-                        "rebuttal_count": len(rebuttals)
-                    })
+                    yield _sse('debate_complete', data={'rounds': len(debate_rounds), 'total_rebuttals': len(all_rebuttals)})
 
-                yield f"data: {json.dumps({'type': 'debate_complete', 'data': {'rounds': len(debate_rounds), 'total_rebuttals': len(all_rebuttals)}})}\n\n"
+                # Devil's advocate (Tier 2)
+                devils_advocate = None
+                if devils_task:
+                    yield _SSE_DEVILS_ADVOCATE_START
 
-            # Devil's advocate (Tier 2)
-            devils_advocate = None
-            if aggregate_rankings:
-                yield f"data: {json.dumps({'type': 'devils_advocate_start'})}\n\n"
-
-                top_model = aggregate_rankings[0]["model"]
-                top_response = next(
-                    (r for r in stage1_results if r["model"] == top_model),
-                    stage1_results[0]
-                )
-                devils_advocate = await stage2_devils_advocate(
-                    request.content, top_response, aggregate_rankings
-                )
+                    devils_advocate = await devils_task
 
-                if devils_advocate:
-                    yield f"data: {json.dumps({'type': 'devils_advocate_complete', 'data': devils_advocate})}\n\n"
+                    if devils_advocate:
+                        yield _sse('devils_advocate_complete', data=devils_advocate)
+            finally:
+                # Don't leave the devil's advocate call running if the debate failed
+                # or the client went away mid-stream
+                if devils_task and not devils_task.done():
+                    devils_task.cancel()
 
             # Stage 3: Synthesize final answer with all context
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
+            yield _SSE_STAGE3_START
             stage3_result = await stage3_synthesize_final(
                 request.content, stage1_results, stage2_results,
                 all_rebuttals, devils_advocate
             )
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            yield _sse('stage3_complete', data=stage3_result)
 
             # Wait for title generation
             if title_task:
                 title = await title_task
                 storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
+                yield _sse('title_complete', data={'title': title})
 
             # Calculate user rank if they participated
             user_rank_info = None
             if request.user_response:
                 from .config import USER_PARTICIPATION_CONFIG
                 user_label = USER_PARTICIPATION_CONFIG.get("user_label", "User")
-                user_ranking = next(
-                    (r for r in aggregate_rankings if r["model"] == user_label),
-                    None
-                )
-                if user_ranking:
+                user_rank = index_aggregate_rankings(aggregate_rankings).get(user_label)
+                if user_rank is not None:
+                    user_ranking = aggregate_rankings[user_rank - 1]
                     user_rank_info = {
-                        "rank": aggregate_rankings.index(user_ranking) + 1,
+                        "rank": user_rank,
                         "average_rank": user_ranking["average_rank"],
                         "total_participants": len(aggregate_rankings)
                     }
-                    yield f"data: {json.dumps({'type': 'user_rank', 'data': user_rank_info})}\n\n"
+                    yield _sse('user_rank', data=user_rank_info)
 
             # Save complete assistant message (extended format)
             storage.add_assistant_message(
@@ -1674,19 +1813,20 @@ async def send_message_stream_v2(conversation_id: str, request: SendMessageV2Req
             )
 
             # Send completion event with full metadata
-            yield f"data: {json.dumps({'type': 'complete', 'metadata': {'debate_rounds': len(debate_rounds), 'total_rebuttals': len(all_rebuttals), 'devils_advocate_included': devils_advocate is not None, 'user_participated': request.user_response is not None, 'user_rank': user_rank_info}})}\n\n"
+            yield _sse('complete', metadata={'debate_rounds': len(debate_rounds), 'total_rebuttals': len(all_rebuttals), 'devils_advocate_included': devils_advocate is not None, 'user_participated': request.user_response is not None, 'user_rank': user_rank_info})
 
         except Exception as e:
-            import traceback
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e), 'traceback': traceback.format_exc()})}\n\n"
+            print(f"Error in council stream: {e}")
+            if DEBUG:
+                import traceback
+                yield _sse('error', message=str(e), traceback=traceback.format_exc())
+            else:
+                yield _sse('error', message=str(e))
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers=_SSE_HEADERS
     )
 
 
@@ -1734,14 +1874,15 @@ async def api_place_prediction(conversation_id: str, request: PlacePredictionReq
             predicted_winner=request.predicted_winner,
             confidence=request.confidence
         )
-        return {
+        invalidate("predictions")
+        return _json_response({
             "id": prediction.id,
             "user_id": prediction.user_id,
             "conversation_id": prediction.conversation_id,
             "predicted_winner": prediction.predicted_winner,
             "confidence": prediction.confidence,
             "placed_at": prediction.placed_at
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1751,6 +1892,7 @@ async def api_resolve_predictions(conversation_id: str, request: ResolvePredicti
     """Resolve all predictions for a conversation."""
     from .predictions.betting import resolve_conversation_predictions
     resolved = resolve_conversation_predictions(conversation_id, request.actual_winner)
+    invalidate("predictions")
 
     # Update Elo ratings
     if resolved:
@@ -1782,13 +1924,14 @@ async def api_get_user_predictions(user_id: str):
 
 
 @app.get("/api/leaderboard")
+@cached_endpoint("predictions")
 async def api_get_leaderboard(
     type: str = "elo",
     limit: int = 20,
     time_period: str = "all"
 ):
     """Get leaderboard data."""
-    return get_leaderboard(type, limit, time_period)
+    return _json_response(get_leaderboard(type, limit, time_period))
 
 
 @app.get("/api/leaderboard/model/{model_id}")
@@ -1798,6 +1941,7 @@ async def api_get_model_stats(model_id: str):
 
 
 @app.get("/api/predictions/summary")
+@cached_endpoint("predictions")
 async def api_get_market_summary():
     """Get prediction market summary."""
     return get_prediction_market_summary()
@@ -1808,12 +1952,14 @@ async def api_get_market_summary():
 # =============================================================================
 
 @app.get("/api/constitution")
+@cached_endpoint("constitution")
 async def api_get_constitution():
     """Get the current constitution."""
     return get_constitution()
 
 
 @app.get("/api/constitution/formatted")
+@cached_endpoint("constitution")
 async def api_get_formatted_constitution(priority_filter: str = None):
     """Get the constitution formatted for display."""
     return {"text": format_constitution_for_prompt(priority_filter=priority_filter)}
@@ -1828,19 +1974,20 @@ async def api_get_article(article_id: str):
     return article
 
 
-@app.get("/api/constitution/history")
+@app.get("/api/constitution/history", response_class=ORJSONResponse)
+@cached_endpoint("constitution")
 async def api_get_constitution_history(limit: int = 50):
     """Get constitution change history."""
     return get_constitution_history(limit)
 
 
-@app.get("/api/amendments")
+@app.get("/api/amendments", response_class=ORJSONResponse)
 async def api_get_amendments():
     """Get all pending amendments."""
     return get_pending_amendments()
 
 
-@app.get("/api/amendments/history")
+@app.get("/api/amendments/history", response_class=ORJSONResponse)
 async def api_get_amendment_history(limit: int = 50):
     """Get amendment history."""
     return get_amendment_history(limit)
@@ -1859,12 +2006,13 @@ async def api_propose_amendment(request: ProposeAmendmentRequest):
             proposed_title=request.proposed_title,
             voting_days=request.voting_days
         )
-        return {
+        invalidate("constitution")
+        return _json_response({
             "id": amendment.id,
             "type": amendment.type,
             "status": amendment.status,
             "voting_deadline": amendment.voting_deadline
-        }
+        })
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1880,12 +2028,13 @@ async def api_vote_on_amendment(amendment_id: str, request: VoteRequest):
     )
     if not amendment:
         raise HTTPException(status_code=404, detail="Amendment not found")
-    return {
+    invalidate("constitution")
+    return _json_response({
         "id": amendment.id,
         "votes_for": amendment.votes_for,
         "votes_against": amendment.votes_against,
         "status": amendment.status
-    }
+    })
 
 
 @app.post("/api/amendments/{amendment_id}/process")
@@ -1894,49 +2043,90 @@ async def api_process_amendment(amendment_id: str):
     amendment = process_amendment_vote(amendment_id)
     if not amendment:
         raise HTTPException(status_code=404, detail="Amendment not found")
-    return {
+    invalidate("constitution")
+    return _json_response({
         "id": amendment.id,
         "status": amendment.status,
         "votes_for": amendment.votes_for,
         "votes_against": amendment.votes_against
-    }
+    })
 
 
 # =============================================================================
 # Tier 4: Observer API
 # =============================================================================
 
-@app.post("/api/observer/analyze/{conversation_id}")
-async def api_run_observer_analysis(conversation_id: str):
-    """Run observer analysis on a conversation."""
+# (conversation_id, message count) -> extracted stage data; messages are
+# append-only, so a new message changes the key and old entries age out
+OBSERVER_STAGES_CACHE_SIZE = 256
+_observer_stages_cache: "OrderedDict[Tuple[str, int], Optional[Tuple]]" = OrderedDict()
+
+# Analyses run in worker threads; the lock keeps writes to the analysis store serialized
+_observer_analysis_lock = asyncio.Lock()
+
+
+def _extract_stages(conversation_id: str) -> Optional[Tuple[List, List, str, str]]:
+    """
+    Get the stage data the observer endpoints analyze for a conversation.
+
+    Args:
+        conversation_id: The conversation ID
+
+    Returns:
+        (stage1, stage2, stage3 text, query) from the last assistant message
+        and last user message, or None if there is no assistant message
+
+    Raises:
+        HTTPException: 404 if the conversation does not exist
+    """
     conversation = storage.get_conversation(conversation_id)
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    # Extract stage data from last assistant message
     messages = conversation.get("messages", [])
-    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
+    key = (conversation_id, len(messages))
+    if key in _observer_stages_cache:
+        _observer_stages_cache.move_to_end(key)
+        return _observer_stages_cache[key]
+
+    # Scan from the end and stop at the first match instead of filtering the whole list
+    last_message = next((m for m in reversed(messages) if m.get("role") == "assistant"), None)
+    if last_message is None:
+        stages = None
+    else:
+        last_user = next((m for m in reversed(messages) if m.get("role") == "user"), None)
+        stages = (
+            last_message.get("stage1", []),
+            last_message.get("stage2", []),
+            last_message.get("stage3", {}).get("content", ""),
+            last_user.get("content", "") if last_user else ""
+        )
 
-    if not assistant_messages:
-        raise HTTPException(status_code=400, detail="No assistant messages to analyze")
+    _observer_stages_cache[key] = stages
+    if len(_observer_stages_cache) > OBSERVER_STAGES_CACHE_SIZE:
+        _observer_stages_cache.popitem(last=False)
+    return stages
 
-    last_message = assistant_messages[-1]
-    stage1 = last_message.get("stage1", [])
-    stage2 = last_message.get("stage2", [])
-    stage3 = last_message.get("stage3", {}).get("content", "")
 
-    # Get original query from user message
-    user_messages = [m for m in messages if m.get("role") == "user"]
-    query = user_messages[-1].get("content", "") if user_messages else ""
+@app.post("/api/observer/analyze/{conversation_id}")
+async def api_run_observer_analysis(conversation_id: str):
+    """Run observer analysis on a conversation."""
+    stages = _extract_stages(conversation_id)
+    if stages is None:
+        raise HTTPException(status_code=400, detail="No assistant messages to analyze")
+    stage1, stage2, stage3, query = stages
 
-    # Run analysis
-    analysis = run_meta_analysis(
-        conversation_id=conversation_id,
-        responses=stage1,
-        rankings=stage2,
-        synthesis=stage3,
-        query=query
-    )
+    # Run analysis off the event loop
+    async with _observer_analysis_lock:
+        analysis = await asyncio.to_thread(
+            run_meta_analysis,
+            conversation_id=conversation_id,
+            responses=stage1,
+            rankings=stage2,
+            synthesis=stage3,
+            query=query
+        )
+    invalidate("observer")
 
     return analysis
 
@@ -1944,26 +2134,13 @@ async def api_run_observer_analysis(conversation_id: str):
 @app.get("/api/observer/report/{conversation_id}")
 async def api_get_observer_report(conversation_id: str, format: str = "full"):
     """Get observer report for a conversation."""
-    conversation = storage.get_conversation(conversation_id)
-    if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # Extract stage data
-    messages = conversation.get("messages", [])
-    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
-
-    if not assistant_messages:
+    stages = _extract_stages(conversation_id)
+    if stages is None:
         raise HTTPException(status_code=400, detail="No assistant messages to analyze")
+    stage1, stage2, stage3, query = stages
 
-    last_message = assistant_messages[-1]
-    stage1 = last_message.get("stage1", [])
-    stage2 = last_message.get("stage2", [])
-    stage3 = last_message.get("stage3", {}).get("content", "")
-
-    user_messages = [m for m in messages if m.get("role") == "user"]
-    query = user_messages[-1].get("content", "") if user_messages else ""
-
-    report = generate_observer_report(
+    report = await asyncio.to_thread(
+        generate_observer_report,
         conversation_id=conversation_id,
         responses=stage1,
         rankings=stage2,
@@ -1978,33 +2155,23 @@ async def api_get_observer_report(conversation_id: str, format: str = "full"):
 @app.get("/api/observer/health/{conversation_id}")
 async def api_get_cognitive_health(conversation_id: str):
     """Get cognitive health score for a conversation."""
-    conversation = storage.get_conversation(conversation_id)
-    if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
-    messages = conversation.get("messages", [])
-    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
-
-    if not assistant_messages:
+    stages = _extract_stages(conversation_id)
+    if stages is None:
         return {"score": 0, "health_level": "unknown", "message": "No data to analyze"}
-
-    last_message = assistant_messages[-1]
-    stage1 = last_message.get("stage1", [])
-    stage2 = last_message.get("stage2", [])
-
-    user_messages = [m for m in messages if m.get("role") == "user"]
-    query = user_messages[-1].get("content", "") if user_messages else ""
+    stage1, stage2, _, query = stages
 
     return get_cognitive_health_score(stage1, stage2, query)
 
 
 @app.get("/api/observer/history")
+@cached_endpoint("observer")
 async def api_get_analysis_history(limit: int = 50):
     """Get observer analysis history."""
-    return get_analysis_history(limit)
+    return _json_response(get_analysis_history(limit))
 
 
 @app.get("/api/observer/statistics")
+@cached_endpoint("observer")
 async def api_get_observer_statistics():
     """Get aggregate observer statistics."""
     return get_aggregate_statistics()
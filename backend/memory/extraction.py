@@ -1,11 +1,172 @@
 """Extract memories from council conversations."""
 
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from .storage import Memory, get_memory_store
 from ..openrouter import query_model
+import asyncio
+import orjson
 import re
 
 
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'what', 'how', 'why',
+    'when', 'where', 'who', 'which', 'can', 'could', 'would', 'should',
+    'do', 'does', 'did', 'have', 'has', 'had', 'be', 'been', 'being',
+    'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from', 'or',
+    'and', 'but', 'if', 'then', 'than', 'that', 'this', 'it', 'its',
+    'i', 'me', 'my', 'you', 'your', 'we', 'our', 'they', 'their'
+})
+
+FACT_EXTRACTION_MODEL = "google/gemini-2.5-flash"
+
+# Fact extractions that queue up while a model call is in flight are
+# coalesced into one call of up to FACT_BATCH_SIZE items
+FACT_BATCH_SIZE = 8
+
+
+def _fact_prompt(user_query: str, synthesis: str) -> str:
+    """Build the single-item fact extraction prompt."""
+    return f"""Given this council synthesis, extract ONE key fact or conclusion that would be worth remembering for future similar questions.
+
+Query: {user_query}
+
+Synthesis:
+{synthesis[:1500]}
+
+Respond with a single sentence summarizing the key takeaway. If nothing notable, respond with "NONE"."""
+
+
+def _batch_fact_prompt(items: List[Tuple[str, str]]) -> str:
+    """Build a fact extraction prompt covering several query/synthesis pairs."""
+    sections = "\n\n".join(
+        f"### ITEM {i} ###\nQuery: {user_query}\n\nSynthesis:\n{synthesis[:1500]}"
+        for i, (user_query, synthesis) in enumerate(items)
+    )
+    return f"""For each council synthesis below, extract ONE key fact or conclusion that would be worth remembering for future similar questions.
+
+{sections}
+
+Respond with only a JSON array containing one object per item, in the form {{"index": <item number>, "fact": "<single sentence>"}}. Use null for "fact" if nothing in that item is notable."""
+
+
+def _clean_fact(content: Optional[str]) -> Optional[str]:
+    """Normalize an extracted fact, returning None when there isn't one."""
+    if not content:
+        return None
+    content = content.strip()
+    if content.upper() == "NONE" or len(content) <= 10:
+        return None
+    return content
+
+
+def _parse_batch_facts(content: str, count: int) -> List[Optional[str]]:
+    """Parse the batched JSON answer into one fact (or None) per item."""
+    facts: List[Optional[str]] = [None] * count
+    start, end = content.find('['), content.rfind(']')
+    if start == -1 or end <= start:
+        return facts
+
+    try:
+        entries = orjson.loads(content[start:end + 1])
+    except orjson.JSONDecodeError:
+        return facts
+
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get('index')
+        fact = entry.get('fact')
+        if isinstance(index, int) and 0 <= index < count and isinstance(fact, str):
+            facts[index] = _clean_fact(fact)
+    return facts
+
+
+class ExtractionBatcher:
+    """Coalesces concurrent fact extractions into batched model calls."""
+
+    def __init__(self, max_batch: int = FACT_BATCH_SIZE):
+        self.max_batch = max_batch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def extract(self, user_query: str, synthesis: str) -> Optional[str]:
+        """
+        Queue a query/synthesis pair and wait for its extracted fact.
+
+        Args:
+            user_query: The original query
+            synthesis: The chairman's synthesis text
+
+        Returns:
+            The extracted fact sentence, or None if nothing notable
+        """
+        loop = asyncio.get_running_loop()
+        # The queue and worker belong to one event loop; start fresh when
+        # called from a different loop (e.g. a second asyncio.run)
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((user_query, synthesis, future))
+        return await future
+
+    async def _run(self):
+        """Collect queued items into batches and dispatch them."""
+        while True:
+            # Never wait for a batch to fill: send the first item straight
+            # away along with whatever is already queued behind it
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        """Run one model call for a batch and resolve each item's future."""
+        items = [(user_query, synthesis) for user_query, synthesis, _ in batch]
+        facts: List[Optional[str]] = [None] * len(batch)
+
+        try:
+            if len(items) == 1:
+                prompt = _fact_prompt(*items[0])
+            else:
+                prompt = _batch_fact_prompt(items)
+
+            response = await query_model(
+                FACT_EXTRACTION_MODEL,
+                [{"role": "user", "content": prompt}],
+                timeout=30.0
+            )
+
+            if response and response.get('content'):
+                if len(items) == 1:
+                    facts[0] = _clean_fact(response['content'])
+                else:
+                    facts = _parse_batch_facts(response['content'], len(items))
+        except Exception as e:
+            print(f"Error extracting fact memory: {e}")
+
+        for (_, _, future), fact in zip(batch, facts):
+            if not future.done():
+                future.set_result(fact)
+
+
+_fact_batcher: Optional[ExtractionBatcher] = None
+
+
+def get_fact_batcher() -> ExtractionBatcher:
+    """Get the singleton fact extraction batcher."""
+    global _fact_batcher
+    if _fact_batcher is None:
+        _fact_batcher = ExtractionBatcher()
+    return _fact_batcher
+
+
 async def extract_memories_from_conversation(
     conversation_id: str,
     user_query: str,
@@ -29,28 +190,36 @@ async def extract_memories_from_conversation(
         List of extracted Memory objects
     """
     store = get_memory_store()
-    extracted_memories = []
 
-    # Extract key facts from the final synthesis
-    fact_memory = await extract_fact_memory(
-        user_query, stage3_result, conversation_id
-    )
-    if fact_memory:
-        extracted_memories.append(fact_memory)
+    # Extract key facts from the final synthesis; start the model call first
+    # so the local extractors below run while it is in flight
+    fact_task = asyncio.create_task(extract_fact_memory(
+        user_query, stage3_result, conversation_id, save=False
+    ))
 
-    # Extract decision patterns from rankings
-    decision_memory = extract_decision_memory(
-        user_query, aggregate_rankings, conversation_id
-    )
-    if decision_memory:
-        extracted_memories.append(decision_memory)
+    try:
+        # Extract decision patterns from rankings
+        decision_memory = extract_decision_memory(
+            user_query, aggregate_rankings, conversation_id, save=False
+        )
 
-    # Extract any notable disagreements or consensus
-    insight_memory = extract_insight_memory(
-        user_query, stage1_results, stage2_results, conversation_id
-    )
-    if insight_memory:
-        extracted_memories.append(insight_memory)
+        # Extract any notable disagreements or consensus
+        insight_memory = extract_insight_memory(
+            user_query, stage1_results, stage2_results, conversation_id, save=False
+        )
+    except BaseException:
+        # Don't leave the model call running detached
+        fact_task.cancel()
+        raise
+
+    fact_memory = await fact_task
+    extracted_memories = [
+        m for m in (fact_memory, decision_memory, insight_memory) if m
+    ]
+
+    # Write the store once for the whole batch
+    if extracted_memories:
+        store.save()
 
     return extracted_memories
 
@@ -58,7 +227,8 @@ async def extract_memories_from_conversation(
 async def extract_fact_memory(
     user_query: str,
     stage3_result: Dict[str, Any],
-    conversation_id: str
+    conversation_id: str,
+    save: bool = True
 ) -> Optional[Memory]:
     """
     Extract key facts from the chairman's synthesis.
@@ -67,6 +237,7 @@ async def extract_fact_memory(
         user_query: The original query
         stage3_result: The synthesis result
         conversation_id: Source conversation ID
+        save: Persist the store after adding the memory
 
     Returns:
         A fact Memory or None
@@ -76,35 +247,20 @@ async def extract_fact_memory(
     if len(synthesis) < 100:
         return None
 
-    # Use a model to extract key facts (simplified - could be more sophisticated)
-    extraction_prompt = f"""Given this council synthesis, extract ONE key fact or conclusion that would be worth remembering for future similar questions.
-
-Query: {user_query}
-
-Synthesis:
-{synthesis[:1500]}
-
-Respond with a single sentence summarizing the key takeaway. If nothing notable, respond with "NONE"."""
-
+    # Use a model to extract key facts; concurrent requests share one call
     try:
-        response = await query_model(
-            "google/gemini-2.5-flash",
-            [{"role": "user", "content": extraction_prompt}],
-            timeout=30.0
-        )
-
-        if response and response.get('content'):
-            content = response['content'].strip()
-            if content.upper() != "NONE" and len(content) > 10:
-                store = get_memory_store()
-                return store.add_memory(
-                    content=content,
-                    memory_type='fact',
-                    related_models=[stage3_result.get('model', '')],
-                    tags=extract_tags_from_query(user_query),
-                    source_conversation=conversation_id,
-                    importance=0.6
-                )
+        content = await get_fact_batcher().extract(user_query, synthesis)
+        if content:
+            store = get_memory_store()
+            return store.add_memory(
+                content=content,
+                memory_type='fact',
+                related_models=[stage3_result.get('model', '')],
+                tags=extract_tags_from_query(user_query),
+                source_conversation=conversation_id,
+                importance=0.6,
+                save=save
+            )
     except Exception as e:
         print(f"Error extracting fact memory: {e}")
 
@@ -114,7 +270,8 @@ Respond with a single sentence summarizing the key takeaway. If nothing notable,
 def extract_decision_memory(
     user_query: str,
     aggregate_rankings: List[Dict[str, Any]],
-    conversation_id: str
+    conversation_id: str,
+    save: bool = True
 ) -> Optional[Memory]:
     """
     Extract decision patterns from the rankings.
@@ -123,6 +280,7 @@ def extract_decision_memory(
         user_query: The original query
         aggregate_rankings: The aggregate rankings
         conversation_id: Source conversation ID
+        save: Persist the store after adding the memory
 
     Returns:
         A decision Memory or None
@@ -142,7 +300,8 @@ def extract_decision_memory(
             related_models=[top_model['model']],
             tags=extract_tags_from_query(user_query),
             source_conversation=conversation_id,
-            importance=0.5
+            importance=0.5,
+            save=save
         )
 
     return None
@@ -152,7 +311,8 @@ def extract_insight_memory(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     stage2_results: List[Dict[str, Any]],
-    conversation_id: str
+    conversation_id: str,
+    save: bool = True
 ) -> Optional[Memory]:
     """
     Extract insights about model agreement/disagreement.
@@ -162,6 +322,7 @@ def extract_insight_memory(
         stage1_results: Individual responses
         stage2_results: Rankings
         conversation_id: Source conversation ID
+        save: Persist the store after adding the memory
 
     Returns:
         An insight Memory or None
@@ -170,46 +331,49 @@ def extract_insight_memory(
     if not stage2_results:
         return None
 
-    # Extract all first choices
-    first_choices = []
+    # Collect distinct first choices in one pass; once there is both a
+    # repeated pick and more than one distinct pick, neither case applies
+    unique_choices = set()
+    has_repeat = False
     for ranking in stage2_results:
-        parsed = ranking.get('parsed_ranking', [])
-        if parsed:
-            first_choices.append(parsed[0])
-
-    if not first_choices:
+        parsed = ranking.get('parsed_ranking')
+        if not parsed:
+            continue
+        if parsed[0] in unique_choices:
+            has_repeat = True
+        else:
+            unique_choices.add(parsed[0])
+        if has_repeat and len(unique_choices) > 1:
+            return None
+
+    if not unique_choices:
         return None
 
     # Check for consensus
-    unique_choices = set(first_choices)
     if len(unique_choices) == 1:
         # Perfect consensus
-        store = get_memory_store()
+        tag = 'consensus'
         content = f"The council reached unanimous consensus on '{extract_topic(user_query)}'"
-
-        return store.add_memory(
-            content=content,
-            memory_type='insight',
-            related_models=[r['model'] for r in stage1_results],
-            tags=['consensus'] + extract_tags_from_query(user_query),
-            source_conversation=conversation_id,
-            importance=0.7
-        )
-    elif len(unique_choices) == len(first_choices):
+        importance = 0.7
+    elif not has_repeat:
         # Complete disagreement
-        store = get_memory_store()
+        tag = 'disagreement'
         content = f"The council showed significant disagreement on '{extract_topic(user_query)}' - each model had different top picks"
+        importance = 0.6
+    else:
+        return None
 
-        return store.add_memory(
-            content=content,
-            memory_type='insight',
-            related_models=[r['model'] for r in stage1_results],
-            tags=['disagreement'] + extract_tags_from_query(user_query),
-            source_conversation=conversation_id,
-            importance=0.6
-        )
-
-    return None
+    # Shared by both outcomes, so built once after the branch is chosen
+    store = get_memory_store()
+    return store.add_memory(
+        content=content,
+        memory_type='insight',
+        related_models=[r['model'] for r in stage1_results],
+        tags=[tag, *_extract_tags_cached(user_query)],
+        source_conversation=conversation_id,
+        importance=importance,
+        save=save
+    )
 
 
 def extract_tags_from_query(query: str) -> List[str]:
@@ -222,25 +386,25 @@ def extract_tags_from_query(query: str) -> List[str]:
     Returns:
         List of tag strings
     """
+    return list(_extract_tags_cached(query))
+
+
+@lru_cache(maxsize=256)
+def _extract_tags_cached(query: str) -> Tuple[str, ...]:
     # Simple keyword extraction
     # Could be enhanced with NLP
-    stopwords = {
-        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'what', 'how', 'why',
-        'when', 'where', 'who', 'which', 'can', 'could', 'would', 'should',
-        'do', 'does', 'did', 'have', 'has', 'had', 'be', 'been', 'being',
-        'to', 'of', 'in', 'for', 'on', 'with', 'at', 'by', 'from', 'or',
-        'and', 'but', 'if', 'then', 'than', 'that', 'this', 'it', 'its',
-        'i', 'me', 'my', 'you', 'your', 'we', 'our', 'they', 'their'
-    }
-
-    words = re.findall(r'\b[a-zA-Z]+\b', query.lower())
-    tags = [w for w in words if w not in stopwords and len(w) > 2]
+    unique_tags = {}
+    for word in _WORD_RE.findall(query.lower()):
+        if len(word) > 2 and word not in _STOPWORDS:
+            unique_tags[word] = None
+            # Return unique tags, limited to 5
+            if len(unique_tags) == 5:
+                break
 
-    # Return unique tags, limited to 5
-    unique_tags = list(dict.fromkeys(tags))
-    return unique_tags[:5]
+    return tuple(unique_tags)
 
 
+@lru_cache(maxsize=256)
 def extract_topic(query: str) -> str:
     """
     Extract a short topic description from a query.
@@ -252,11 +416,7 @@ def extract_topic(query: str) -> str:
         A short topic string
     """
     # Take first 50 chars or first sentence
-    topic = query[:50]
-    if '?' in topic:
-        topic = topic.split('?')[0]
-    if '.' in topic:
-        topic = topic.split('.')[0]
+    topic = query[:50].partition('?')[0].partition('.')[0]
 
     return topic.strip()
 
@@ -1,10 +1,45 @@
 """Inject memories into prompts for context-aware responses."""
 
-from typing import List, Dict, Any, Optional
-from .storage import Memory
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from .storage import Memory, get_memory_store
 from .retrieval import get_relevant_memories, get_memories_for_model
 
 
+# The same query is injected into several model prompts per council round;
+# reuse retrieval results for a short window instead of rescanning the store.
+# Entries are keyed on the store generation, so any add, update or delete
+# makes them miss.
+RETRIEVAL_CACHE_TTL = 10.0
+_retrieval_cache: Dict[tuple, Tuple[float, Tuple[Memory, ...]]] = {}
+
+
+def _cached_relevant_memories(
+    query: str,
+    context: Dict[str, Any] = None,
+    limit: int = None
+) -> Tuple[Memory, ...]:
+    """Short-lived cache in front of get_relevant_memories; returns an immutable tuple."""
+    store = get_memory_store()
+    key = (store.generation, query, tuple(sorted((context or {}).items())), limit)
+    now = time.monotonic()
+
+    hit = _retrieval_cache.get(key)
+    if hit is not None and hit[0] > now:
+        # Count the access as a fresh retrieval would
+        for memory in hit[1]:
+            store.record_access(memory.id)
+        return hit[1]
+
+    # Evict expired entries on each miss so the cache stays small
+    for stale in [k for k, (expires_at, _) in _retrieval_cache.items() if expires_at <= now]:
+        del _retrieval_cache[stale]
+
+    memories = tuple(get_relevant_memories(query, context, limit=limit))
+    _retrieval_cache[key] = (now + RETRIEVAL_CACHE_TTL, memories)
+    return memories
+
+
 def build_memory_context(
     memories: List[Memory],
     max_length: int = 1500
@@ -26,20 +61,16 @@ def build_memory_context(
     current_length = 0
 
     for memory in memories:
-        # Format memory entry
-        memory_entry = f"- [{memory.type.upper()}] {memory.content}"
-
-        if memory.tags:
-            memory_entry += f" (tags: {', '.join(memory.tags)})"
-
-        entry_length = len(memory_entry)
+        # Format memory entry in one pass, tags suffix only when present
+        tag_suffix = f" (tags: {', '.join(memory.tags)})" if memory.tags else ""
+        memory_entry = f"- [{memory.type.upper()}] {memory.content}{tag_suffix}"
 
-        # Check if we'd exceed max length
-        if current_length + entry_length + 1 > max_length:
+        # Running length includes one newline per entry
+        current_length += len(memory_entry) + 1
+        if current_length > max_length:
             break
 
         context_parts.append(memory_entry)
-        current_length += entry_length + 1  # +1 for newline
 
     return "\n".join(context_parts)
 
@@ -63,7 +94,7 @@ def inject_memory_into_prompt(
         Enhanced prompt with memory context
     """
     # Get relevant memories
-    memories = get_relevant_memories(query, context, limit=max_memories)
+    memories = _cached_relevant_memories(query, context, limit=max_memories)
 
     if not memories:
         return base_prompt
@@ -108,22 +139,21 @@ def inject_model_memories(
     Returns:
         Enhanced prompt with model-specific memories
     """
+    if max_memories <= 0:
+        return base_prompt
+
     # Get model-specific memories
     model_memories = get_memories_for_model(model_id, limit=max_memories)
 
-    # Also get query-relevant memories
-    query_memories = get_relevant_memories(query, limit=max_memories)
-
-    # Combine and deduplicate
-    all_memory_ids = set()
-    combined_memories = []
+    # Model memories take priority; only search by query if there is room left
+    query_memories = []
+    if len(model_memories) < max_memories:
+        query_memories = list(_cached_relevant_memories(query, limit=max_memories))
 
-    for memory in model_memories + query_memories:
-        if memory.id not in all_memory_ids:
-            all_memory_ids.add(memory.id)
-            combined_memories.append(memory)
-            if len(combined_memories) >= max_memories:
-                break
+    # Combine and deduplicate by id (dicts keep first-insertion order)
+    combined_memories = list(
+        {m.id: m for m in model_memories + query_memories}.values()
+    )[:max_memories]
 
     if not combined_memories:
         return base_prompt
@@ -158,7 +188,7 @@ def create_memory_aware_ranking_prompt(
         Memory-enhanced ranking prompt
     """
     # Get memories related to past rankings and decisions
-    memories = get_relevant_memories(
+    memories = _cached_relevant_memories(
         query,
         context={'topic': 'ranking'},
         limit=3
@@ -178,9 +208,9 @@ Consider this context when evaluating the responses, but judge each response on
 """
 
     # Insert after the responses but before the ranking instructions
-    if "Your task:" in base_ranking_prompt:
-        parts = base_ranking_prompt.split("Your task:")
-        return parts[0] + memory_note + "Your task:" + parts[1]
+    before, marker, after = base_ranking_prompt.partition("Your task:")
+    if marker:
+        return before + memory_note + marker + after
 
     return base_ranking_prompt + "\n" + memory_note
 
@@ -196,7 +226,7 @@ def get_synthesis_memories(query: str, limit: int = 3) -> str:
     Returns:
         Formatted memory context for synthesis
     """
-    memories = get_relevant_memories(
+    memories = _cached_relevant_memories(
         query,
         context={'topic': 'synthesis', 'type': 'decision'},
         limit=limit
@@ -0,0 +1,232 @@
+"""Debounced persistence for the JSON-backed memory stores."""
+
+import atexit
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import orjson
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+
+# Serialized snapshots waiting to be written, in the order they were taken.
+# One writer thread drains it, so writes to the same file never reorder.
+_write_queue: "queue.Queue[Tuple[Path, bytes]]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _backup_path(path: Path) -> Path:
+    """Get the path the previous version of a file is kept at."""
+    return path.with_name(path.name + ".bak")
+
+
+def _keep_backup(path: Path, link_path: str):
+    """
+    Point the .bak file at the current contents of path, leaving path in place.
+
+    Args:
+        path: File about to be replaced
+        link_path: Unused name in the same directory to stage the backup at
+    """
+    try:
+        # A hard link costs no copy; the old contents stay reachable from
+        # the backup once path is replaced with a new file
+        os.link(path, link_path)
+    except FileNotFoundError:
+        return
+    except OSError:
+        shutil.copy2(path, link_path)
+    os.replace(link_path, _backup_path(path))
+    # rename() is a no-op when both names already link the same file
+    Path(link_path).unlink(missing_ok=True)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Replace a file's contents without ever leaving a partial file behind.
+
+    The data goes to a uniquely named temp file that is renamed over the
+    target, so path always holds either the old or the new contents; the
+    previous version is also kept next to it as a .bak for load_json.
+    Callers must serialize writes to the same path.
+
+    Args:
+        path: Destination file
+        data: Full file contents
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False
+    ) as f:
+        tmp_path = f.name
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        # Temp files are created 0600; keep the mode the file had before
+        try:
+            shutil.copymode(path, tmp_path)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        _keep_backup(path, tmp_path + '.bak')
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_json(path: Path) -> Optional[Any]:
+    """
+    Load a file written by atomic_write_bytes, falling back to its backup.
+
+    Args:
+        path: File to load
+
+    Returns:
+        Parsed JSON, or None if neither the file nor its backup is readable
+    """
+    for candidate in (path, _backup_path(path)):
+        try:
+            return orjson.loads(candidate.read_bytes())
+        except FileNotFoundError:
+            continue
+        except (orjson.JSONDecodeError, OSError) as e:
+            print(f"Error loading {candidate}: {e}")
+    return None
+
+
+def _write_worker():
+    """Write queued snapshots to disk, one at a time."""
+    while True:
+        path, data = _write_queue.get()
+        try:
+            atomic_write_bytes(path, data)
+        except OSError as e:
+            print(f"Error writing {path}: {e}")
+        finally:
+            _write_queue.task_done()
+
+
+def write_in_background(path: Path, data: bytes):
+    """
+    Queue bytes to be written to a file by the writer thread.
+
+    Args:
+        path: Destination file
+        data: Full file contents
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_worker, name="store-writer", daemon=True)
+            _writer.start()
+    _write_queue.put((path, data))
+
+
+def wait_for_writes():
+    """Block until every queued write has reached disk."""
+    _write_queue.join()
+
+
+class DebouncedSaver:
+    """
+    Coalesces store writes into one save per quiet period.
+
+    Mutations call mark_dirty() under `lock`; the store is serialized once
+    no change has arrived for `delay` seconds, or immediately after
+    `batch_size` pending changes. Serializing happens under the lock so the
+    snapshot is consistent; the disk write happens on the writer thread.
+    Pending changes are also flushed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        serialize: Callable[[], bytes],
+        path: str,
+        delay: float,
+        batch_size: int
+    ):
+        self.lock = threading.RLock()
+        self._serialize = serialize
+        self._path = Path(path)
+        self._delay = delay
+        self._batch_size = batch_size
+        self._dirty = False
+        self._pending_ops = 0
+        # Monotonic time the pending save is due; each change pushes it back
+        self._deadline = 0.0
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def mark_dirty(self):
+        """Record a change and schedule (or force) a save."""
+        with self.lock:
+            self._dirty = True
+            self._pending_ops += 1
+            if self._pending_ops >= self._batch_size:
+                self.save()
+                return
+            # Moving the deadline is enough; the running timer re-checks it
+            # when it fires rather than being replaced on every change
+            self._deadline = time.monotonic() + self._delay
+            if self._timer is None:
+                self._start_timer(self._delay)
+
+    def _start_timer(self, delay: float):
+        """Start the timer that saves once the deadline has passed; the caller holds the lock."""
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        """Save if the deadline has passed, otherwise wait out the rest of it."""
+        with self.lock:
+            if self._timer is not threading.current_thread():
+                return  # Cancelled by a save() that got the lock first
+            remaining = self._deadline - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+            self.save()
+
+    def save(self, force: bool = False):
+        """
+        Snapshot pending changes and queue them for writing; does not wait.
+
+        Args:
+            force: Save even if no change was recorded
+        """
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty or force:
+                try:
+                    data = self._serialize()
+                except TypeError as e:
+                    # Keep the last good file and the dirty flag
+                    print(f"Error serializing {self._path}: {e}")
+                    return
+                write_in_background(self._path, data)
+                self._dirty = False
+                self._pending_ops = 0
+
+    def flush(self, force: bool = False):
+        """
+        Write pending changes and wait until they are on disk.
+
+        Args:
+            force: Save even if no change was recorded
+        """
+        self.save(force)
+        wait_for_writes()
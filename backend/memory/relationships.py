@@ -1,12 +1,21 @@
 """Track and analyze relationships between council models."""
 
-import json
+import heapq
+import orjson
 import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from itertools import combinations
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from collections import deque
+from dataclasses import dataclass, field
 from ..config import MEMORY_CONFIG
+from .persistence import DebouncedSaver, load_json
+
+
+# Number of recent interactions the agreement rate is computed over
+AGREEMENT_WINDOW = 20
 
 
 @dataclass
@@ -17,7 +26,25 @@ class ModelRelationship:
     agreement_rate: float  # 0-1, how often they rank similarly
     interaction_count: int
     last_interaction: str
-    agreement_history: List[bool]  # Recent agreement/disagreement
+    agreement_history: Deque[bool]  # Recent agreement/disagreement
+    agreement_true_count: int = field(init=False)  # Agreements in the history
+
+    def __post_init__(self):
+        self.agreement_history = deque(self.agreement_history, maxlen=AGREEMENT_WINDOW)
+        self.agreement_true_count = sum(self.agreement_history)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        # Shallow on purpose: asdict() would deep-copy the history only for
+        # it to be converted again; the count is derived on load
+        return {
+            'model_a': self.model_a,
+            'model_b': self.model_b,
+            'agreement_rate': self.agreement_rate,
+            'interaction_count': self.interaction_count,
+            'last_interaction': self.last_interaction,
+            'agreement_history': list(self.agreement_history),
+        }
 
 
 class RelationshipTracker:
@@ -28,6 +55,12 @@ class RelationshipTracker:
             'relationships_path', 'data/memory/relationships.json'
         )
         self.relationships: Dict[str, ModelRelationship] = {}
+        self._saver = DebouncedSaver(
+            self._serialize_relationships,
+            self.storage_path,
+            delay=MEMORY_CONFIG.get('save_debounce_seconds', 0.5),
+            batch_size=MEMORY_CONFIG.get('save_batch_size', 200)
+        )
         self._ensure_storage_dir()
         self._load_relationships()
 
@@ -41,30 +74,28 @@ class RelationshipTracker:
 
     def _load_relationships(self):
         """Load relationships from JSON file."""
-        if os.path.exists(self.storage_path):
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    for key, rel_data in data.get('relationships', {}).items():
-                        self.relationships[key] = ModelRelationship(**rel_data)
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Error loading relationships: {e}")
-                self.relationships = {}
-        else:
+        # Falls back to the backup copy if the main file is unreadable
+        data = load_json(Path(self.storage_path))
+        if data is None:
+            self.relationships = {}
+            return
+        try:
+            for key, rel_data in data.get('relationships', {}).items():
+                self.relationships[key] = ModelRelationship(**rel_data)
+        except (TypeError, KeyError) as e:
+            print(f"Error loading relationships: {e}")
             self.relationships = {}
 
-    def _save_relationships(self):
-        """Save relationships to JSON file."""
-        self._ensure_storage_dir()
+    def _serialize_relationships(self) -> bytes:
+        """Serialize relationships to JSON file contents."""
         data = {
             'version': '1.0',
             'last_updated': datetime.utcnow().isoformat(),
             'relationships': {
-                key: asdict(rel) for key, rel in self.relationships.items()
+                key: rel.to_dict() for key, rel in self.relationships.items()
             }
         }
-        with open(self.storage_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
 
     def get_relationship(
         self,
@@ -79,7 +110,8 @@ class RelationshipTracker:
         self,
         model_a: str,
         model_b: str,
-        agreed: bool
+        agreed: bool,
+        timestamp: Optional[str] = None
     ):
         """
         Record an interaction between two models.
@@ -88,21 +120,37 @@ class RelationshipTracker:
             model_a: First model
             model_b: Second model
             agreed: Whether they agreed (ranked similarly)
+            timestamp: ISO timestamp to record; defaults to now
         """
+        timestamp = timestamp or datetime.utcnow().isoformat()
+        with self._saver.lock:
+            self._apply_interaction(model_a, model_b, agreed, timestamp)
+            self._saver.mark_dirty()
+
+    def _apply_interaction(
+        self,
+        model_a: str,
+        model_b: str,
+        agreed: bool,
+        timestamp: str
+    ):
+        """Update one pair in memory; the caller holds the lock and marks dirty."""
         key = self._get_pair_key(model_a, model_b)
 
         if key in self.relationships:
             rel = self.relationships[key]
             rel.interaction_count += 1
-            rel.last_interaction = datetime.utcnow().isoformat()
+            rel.last_interaction = timestamp
 
-            # Update agreement history (keep last 20 interactions)
-            rel.agreement_history.append(agreed)
-            if len(rel.agreement_history) > 20:
-                rel.agreement_history = rel.agreement_history[-20:]
+            # Update agreement history; the deque drops the oldest entry
+            # once full, so keep the running count in step with it
+            history = rel.agreement_history
+            if len(history) == history.maxlen:
+                rel.agreement_true_count -= history[0]
+            history.append(agreed)
+            rel.agreement_true_count += agreed
 
-            # Recalculate agreement rate
-            rel.agreement_rate = sum(rel.agreement_history) / len(rel.agreement_history)
+            rel.agreement_rate = rel.agreement_true_count / len(history)
         else:
             # Create new relationship
             self.relationships[key] = ModelRelationship(
@@ -110,11 +158,13 @@ class RelationshipTracker:
                 model_b=max(model_a, model_b),
                 agreement_rate=1.0 if agreed else 0.0,
                 interaction_count=1,
-                last_interaction=datetime.utcnow().isoformat(),
+                last_interaction=timestamp,
                 agreement_history=[agreed]
             )
 
-        self._save_relationships()
+    def flush(self):
+        """Write any pending changes to disk now."""
+        self._saver.flush()
 
     def update_from_rankings(
         self,
@@ -128,31 +178,26 @@ class RelationshipTracker:
             rankings: List of model rankings
             label_to_model: Mapping from labels to model names
         """
-        # Extract parsed rankings
-        model_rankings = {}
+        # Top 2 choices per model, as model names, built once per model
+        top_choices = {}
         for ranking in rankings:
-            model = ranking['model']
             parsed = ranking.get('parsed_ranking', [])
             if parsed:
-                # Convert labels to model names
-                model_rankings[model] = [
-                    label_to_model.get(label, label) for label in parsed
-                ]
-
-        # Compare each pair of models
-        models = list(model_rankings.keys())
-        for i, model_a in enumerate(models):
-            for model_b in models[i + 1:]:
-                ranking_a = model_rankings.get(model_a, [])
-                ranking_b = model_rankings.get(model_b, [])
-
-                if ranking_a and ranking_b:
-                    # Check if top 2 choices overlap
-                    top_a = set(ranking_a[:2]) if len(ranking_a) >= 2 else set(ranking_a)
-                    top_b = set(ranking_b[:2]) if len(ranking_b) >= 2 else set(ranking_b)
-                    agreed = len(top_a & top_b) > 0
-
-                    self.record_interaction(model_a, model_b, agreed)
+                top_choices[ranking['model']] = frozenset(
+                    label_to_model.get(label, label) for label in parsed[:2]
+                )
+
+        # Compare each pair of models; one timestamp for the whole round
+        # and a single dirty mark (one scheduled save) for all pairs
+        timestamp = datetime.utcnow().isoformat()
+        if len(top_choices) < 2:
+            return
+        with self._saver.lock:
+            for (model_a, top_a), (model_b, top_b) in combinations(top_choices.items(), 2):
+                # Agreement means the top 2 choices overlap
+                agreed = not top_a.isdisjoint(top_b)
+                self._apply_interaction(model_a, model_b, agreed, timestamp)
+            self._saver.mark_dirty()
 
     def get_all_relationships(self) -> List[ModelRelationship]:
         """Get all tracked relationships."""
@@ -160,20 +205,19 @@ class RelationshipTracker:
 
     def get_strongest_agreements(self, limit: int = 5) -> List[ModelRelationship]:
         """Get model pairs with highest agreement rates."""
-        sorted_rels = sorted(
+        return heapq.nlargest(
+            limit,
             self.relationships.values(),
-            key=lambda r: (r.agreement_rate, r.interaction_count),
-            reverse=True
+            key=lambda r: (r.agreement_rate, r.interaction_count)
         )
-        return sorted_rels[:limit]
 
     def get_strongest_disagreements(self, limit: int = 5) -> List[ModelRelationship]:
         """Get model pairs with lowest agreement rates."""
-        sorted_rels = sorted(
+        return heapq.nsmallest(
+            limit,
             self.relationships.values(),
             key=lambda r: (r.agreement_rate, -r.interaction_count)
         )
-        return sorted_rels[:limit]
 
     def get_model_allies(self, model: str, limit: int = 3) -> List[Tuple[str, float]]:
         """
@@ -193,8 +237,7 @@ class RelationshipTracker:
             elif rel.model_b == model:
                 allies.append((rel.model_a, rel.agreement_rate))
 
-        allies.sort(key=lambda x: x[1], reverse=True)
-        return allies[:limit]
+        return heapq.nlargest(limit, allies, key=lambda x: x[1])
 
     def get_model_rivals(self, model: str, limit: int = 3) -> List[Tuple[str, float]]:
         """
@@ -214,8 +257,7 @@ class RelationshipTracker:
             elif rel.model_b == model:
                 rivals.append((rel.model_a, 1 - rel.agreement_rate))
 
-        rivals.sort(key=lambda x: x[1], reverse=True)
-        return rivals[:limit]
+        return heapq.nlargest(limit, rivals, key=lambda x: x[1])
 
     def get_relationship_summary(self) -> Dict[str, Any]:
         """Get a summary of all relationships."""
@@ -240,11 +282,16 @@ class RelationshipTracker:
 
 # Singleton instance
 _relationship_tracker: Optional[RelationshipTracker] = None
+_relationship_tracker_lock = threading.Lock()
 
 
 def get_relationship_tracker() -> RelationshipTracker:
     """Get the singleton relationship tracker instance."""
     global _relationship_tracker
+    # Double-checked so concurrent first calls can't build two instances
+    # that then overwrite each other's file
     if _relationship_tracker is None:
-        _relationship_tracker = RelationshipTracker()
+        with _relationship_tracker_lock:
+            if _relationship_tracker is None:
+                _relationship_tracker = RelationshipTracker()
     return _relationship_tracker
@@ -1,49 +1,50 @@
 """Memory retrieval and relevance search."""
 
-from typing import List, Dict, Any, Tuple
-from .storage import Memory, get_memory_store
+import heapq
+from typing import List, Dict, Any, Tuple, FrozenSet, Optional
+from .storage import Memory, get_memory_store, tokenize
 from ..config import MEMORY_CONFIG
-import re
 
 
-def calculate_keyword_relevance(query: str, memory: Memory) -> float:
+# Share of the relevance score contributed by importance alone
+IMPORTANCE_WEIGHT = 0.2
+
+
+def calculate_keyword_relevance(
+    query: str,
+    memory: Memory,
+    query_words: Optional[FrozenSet[str]] = None
+) -> float:
     """
     Calculate relevance score based on keyword matching.
 
     Args:
         query: The search query
         memory: The memory to score
+        query_words: Pre-tokenized query, when scoring many memories
 
     Returns:
         Relevance score between 0 and 1
     """
     # Extract keywords from query (simple word tokenization)
-    query_words = set(re.findall(r'\b\w+\b', query.lower()))
-
-    # Get words from memory content
-    content_words = set(re.findall(r'\b\w+\b', memory.content.lower()))
-
-    # Get words from memory tags
-    tag_words = set()
-    for tag in memory.tags:
-        tag_words.update(re.findall(r'\b\w+\b', tag.lower()))
-
-    # Calculate overlap
-    content_overlap = len(query_words & content_words)
-    tag_overlap = len(query_words & tag_words)
+    if query_words is None:
+        query_words = tokenize(query)
 
     if not query_words:
         return 0.0
 
+    # Content and tag words are tokenized once per memory by the store
+    content_words, tag_words = get_memory_store().get_tokens(memory)
+
     # Content match is weighted more heavily, tags provide boost
-    content_score = content_overlap / len(query_words) if query_words else 0
-    tag_score = tag_overlap / len(query_words) if query_words else 0
+    content_score = len(query_words & content_words) / len(query_words)
+    tag_score = len(query_words & tag_words) / len(query_words)
 
     # Combine scores (content: 70%, tags: 30%)
     base_score = (content_score * 0.7) + (tag_score * 0.3)
 
     # Apply importance multiplier
-    importance_boost = memory.importance * 0.2
+    importance_boost = memory.importance * IMPORTANCE_WEIGHT
 
     # Apply recency boost (newer memories get slight boost)
     # Not implemented fully here but could be added
@@ -72,10 +73,18 @@ def search_memories(
         List of (memory, relevance_score) tuples, sorted by relevance
     """
     store = get_memory_store()
-    memories = store.get_all_memories()
 
     min_relevance = min_relevance or MEMORY_CONFIG.get('memory_relevance_threshold', 0.3)
     limit = limit or MEMORY_CONFIG.get('max_memories_per_query', 5)
+    query_words = tokenize(query)
+
+    # A memory sharing no word with the query scores only its importance
+    # boost; unless that can reach the threshold, score only the memories
+    # the inverted index says share a word
+    if store.importance_ceiling * IMPORTANCE_WEIGHT < min_relevance:
+        memories = store.get_keyword_candidates(query_words)
+    else:
+        memories = store.get_all_memories()
 
     # Filter by type if specified
     if memory_types:
@@ -86,17 +95,17 @@ def search_memories(
         memories = [m for m in memories if any(t in m.tags for t in tags)]
 
     # Calculate relevance scores
-    scored_memories = []
-    for memory in memories:
-        score = calculate_keyword_relevance(query, memory)
-        if score >= min_relevance:
-            scored_memories.append((memory, score))
-
-    # Sort by relevance (descending)
-    scored_memories.sort(key=lambda x: x[1], reverse=True)
+    scored_memories = (
+        (memory, calculate_keyword_relevance(query, memory, query_words))
+        for memory in memories
+    )
 
-    # Limit results
-    results = scored_memories[:limit]
+    # Keep the top results by relevance (descending)
+    results = heapq.nlargest(
+        limit,
+        (pair for pair in scored_memories if pair[1] >= min_relevance),
+        key=lambda x: x[1]
+    )
 
     # Record access for retrieved memories
     for memory, _ in results:
@@ -156,14 +165,8 @@ def get_memories_for_model(model_id: str, limit: int = 5) -> List[Memory]:
     store = get_memory_store()
     memories = store.get_memories_by_model(model_id)
 
-    # Sort by importance and recency
-    sorted_memories = sorted(
-        memories,
-        key=lambda m: (m.importance, m.created_at),
-        reverse=True
-    )
-
-    return sorted_memories[:limit]
+    # Top by importance, then recency
+    return heapq.nlargest(limit, memories, key=lambda m: (m.importance, m.created_at))
 
 
 def get_relationship_memories(
@@ -191,7 +194,5 @@ def get_relationship_memories(
         if model_a in m.related_models and model_b in m.related_models
     ]
 
-    # Sort by recency
-    relevant.sort(key=lambda m: m.created_at, reverse=True)
-
-    return relevant[:limit]
+    # Most recent first
+    return heapq.nlargest(limit, relevant, key=lambda m: m.created_at)
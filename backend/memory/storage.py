@@ -1,13 +1,18 @@
 """JSON-based memory storage for the council."""
 
-import json
+import heapq
+import orjson
 import os
+import threading
+import re
 import uuid
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from ..config import MEMORY_CONFIG
+from .persistence import DebouncedSaver, load_json
 
 
 @dataclass
@@ -25,6 +30,21 @@ class Memory:
     last_accessed: Optional[str] = None
 
 
+_MEMORY_FIELDS = frozenset(f.name for f in fields(Memory))
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Split text into the lower-cased word set used for keyword matching."""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _memory_tokens(memory: Memory) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Tokenize a memory's content and tags."""
+    return tokenize(memory.content), tokenize(' '.join(memory.tags))
+
+
 class MemoryStore:
     """Manages persistent memory storage."""
 
@@ -33,8 +53,33 @@ class MemoryStore:
             'storage_path', 'data/memory/memories.json'
         )
         self.memories: List[Memory] = []
+        # Indices kept in sync on every mutation; the grouped ones map
+        # memory id -> Memory so they preserve insertion order
+        self._by_id: Dict[str, Memory] = {}
+        self._by_type: Dict[str, Dict[str, Memory]] = defaultdict(dict)
+        self._by_tag: Dict[str, Dict[str, Memory]] = defaultdict(dict)
+        self._by_model: Dict[str, Dict[str, Memory]] = defaultdict(dict)
+        # memory id -> (content words, tag words), tokenized once per change
+        self._tokens: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+        # word -> memories whose content or tags contain it
+        self._inverted: Dict[str, Dict[str, Memory]] = defaultdict(dict)
+        # memory id -> sequence number that follows the order of self.memories
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        # Upper bound on importance (not lowered on delete), for search pruning
+        self.importance_ceiling = 0.0
+        # Bumped whenever memories are added, changed or removed, so callers
+        # caching retrieval results can tell when they are stale
+        self.generation = 0
+        self._saver = DebouncedSaver(
+            self._serialize_memories,
+            self.storage_path,
+            delay=MEMORY_CONFIG.get('save_debounce_seconds', 0.5),
+            batch_size=MEMORY_CONFIG.get('save_batch_size', 200)
+        )
         self._ensure_storage_dir()
         self._load_memories()
+        self._rebuild_indices()
 
     def _ensure_storage_dir(self):
         """Ensure the storage directory exists."""
@@ -42,30 +87,76 @@ class MemoryStore:
 
     def _load_memories(self):
         """Load memories from JSON file."""
-        if os.path.exists(self.storage_path):
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    self.memories = [
-                        Memory(**m) for m in data.get('memories', [])
-                    ]
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Error loading memories: {e}")
-                self.memories = []
-        else:
+        # Falls back to the backup copy if the main file is unreadable
+        data = load_json(Path(self.storage_path))
+        if data is None:
+            self.memories = []
+            return
+        try:
+            self.memories = [
+                Memory(**m) for m in data.get('memories', [])
+            ]
+        except (TypeError, KeyError) as e:
+            print(f"Error loading memories: {e}")
             self.memories = []
 
-    def _save_memories(self):
-        """Save memories to JSON file."""
-        self._ensure_storage_dir()
+    def _rebuild_indices(self):
+        """Rebuild the indices from the memory list."""
+        self._by_id.clear()
+        self._tokens.clear()
+        self._inverted.clear()
+        self.importance_ceiling = 0.0
+        self._by_type.clear()
+        self._by_tag.clear()
+        self._by_model.clear()
+        self._positions = {memory.id: i for i, memory in enumerate(self.memories)}
+        self._next_position = len(self.memories)
+        for memory in self.memories:
+            self._index(memory)
+
+    def _index(self, memory: Memory):
+        """Add a memory to the indices."""
+        self._by_id[memory.id] = memory
+        content_words, tag_words = self._tokens[memory.id] = _memory_tokens(memory)
+        for word in content_words | tag_words:
+            self._inverted[word][memory.id] = memory
+        self.importance_ceiling = max(self.importance_ceiling, memory.importance)
+        self._by_type[memory.type][memory.id] = memory
+        for tag in memory.tags:
+            self._by_tag[tag][memory.id] = memory
+        for model_id in memory.related_models:
+            self._by_model[model_id][memory.id] = memory
+
+    def _unindex(self, memory: Memory):
+        """Remove a memory from the indices."""
+        self._by_id.pop(memory.id, None)
+        content_words, tag_words = self._tokens.pop(memory.id, (frozenset(), frozenset()))
+        for word in content_words | tag_words:
+            self._inverted[word].pop(memory.id, None)
+            if not self._inverted[word]:
+                del self._inverted[word]
+        self._by_type[memory.type].pop(memory.id, None)
+        if not self._by_type[memory.type]:
+            del self._by_type[memory.type]
+        for tag in memory.tags:
+            self._by_tag[tag].pop(memory.id, None)
+            if not self._by_tag[tag]:
+                del self._by_tag[tag]
+        for model_id in memory.related_models:
+            self._by_model[model_id].pop(memory.id, None)
+            if not self._by_model[model_id]:
+                del self._by_model[model_id]
+
+    def _serialize_memories(self) -> bytes:
+        """Serialize the store to JSON file contents."""
         data = {
             'version': '1.0',
             'last_updated': datetime.utcnow().isoformat(),
             'memory_count': len(self.memories),
-            'memories': [asdict(m) for m in self.memories]
+            # orjson encodes the dataclasses directly, no asdict() deep copy
+            'memories': self.memories
         }
-        with open(self.storage_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
 
     def add_memory(
         self,
@@ -74,7 +165,8 @@ class MemoryStore:
         related_models: List[str] = None,
         tags: List[str] = None,
         source_conversation: str = None,
-        importance: float = 0.5
+        importance: float = 0.5,
+        save: bool = True
     ) -> Memory:
         """
         Add a new memory to the store.
@@ -86,6 +178,7 @@ class MemoryStore:
             tags: List of tags for categorization
             source_conversation: ID of the conversation that generated this memory
             importance: Importance score (0-1)
+            save: Schedule a save; batch callers pass False and call save()
 
         Returns:
             The created Memory object
@@ -102,70 +195,134 @@ class MemoryStore:
             access_count=0,
             last_accessed=None
         )
-        self.memories.append(memory)
-        self._save_memories()
+        with self._saver.lock:
+            self.memories.append(memory)
+            self._positions[memory.id] = self._next_position
+            self._next_position += 1
+            self._index(memory)
+            self.generation += 1
+        if save:
+            self._saver.mark_dirty()
         return memory
 
+    def save(self):
+        """Queue a write of the store, e.g. after a batch of add_memory(save=False) calls."""
+        self._saver.save(force=True)
+
+    def flush(self):
+        """Write any pending changes to disk now."""
+        self._saver.flush()
+
     def get_memory(self, memory_id: str) -> Optional[Memory]:
         """Get a memory by ID."""
-        for memory in self.memories:
-            if memory.id == memory_id:
-                return memory
-        return None
+        return self._by_id.get(memory_id)
 
     def update_memory(self, memory_id: str, **updates) -> Optional[Memory]:
         """Update a memory's attributes."""
-        for i, memory in enumerate(self.memories):
-            if memory.id == memory_id:
-                memory_dict = asdict(memory)
-                memory_dict.update(updates)
-                self.memories[i] = Memory(**memory_dict)
-                self._save_memories()
-                return self.memories[i]
-        return None
+        unknown = updates.keys() - _MEMORY_FIELDS
+        if unknown:
+            raise TypeError(f"Unknown memory fields: {', '.join(sorted(unknown))}")
+
+        with self._saver.lock:
+            memory = self._by_id.get(memory_id)
+            if memory is None:
+                return None
+            self._unindex(memory)
+            for name, value in updates.items():
+                setattr(memory, name, value)
+            self._index(memory)
+            self.generation += 1
+            self._saver.mark_dirty()
+            return memory
 
     def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory by ID."""
-        for i, memory in enumerate(self.memories):
-            if memory.id == memory_id:
-                del self.memories[i]
-                self._save_memories()
-                return True
-        return False
+        with self._saver.lock:
+            memory = self._by_id.get(memory_id)
+            if memory is None:
+                return False
+            # Identity scan; avoids dataclass __eq__ on every element
+            for i, candidate in enumerate(self.memories):
+                if candidate is memory:
+                    del self.memories[i]
+                    break
+            self._unindex(memory)
+            del self._positions[memory_id]
+            self.generation += 1
+            self._saver.mark_dirty()
+            return True
+
+    def get_tokens(self, memory: Memory) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """Get the cached (content words, tag words) for a memory."""
+        if self._by_id.get(memory.id) is memory:
+            return self._tokens[memory.id]
+        return _memory_tokens(memory)
+
+    def get_keyword_candidates(self, words: FrozenSet[str]) -> List[Memory]:
+        """Get the memories whose content or tags contain any of the words, in store order."""
+        candidates: Dict[str, Memory] = {}
+        for word in words:
+            candidates.update(self._inverted.get(word, {}))
+        # Iterating the word set is hash-seeded; sort so ties in relevance
+        # break the same way as a scan of self.memories would
+        positions = self._positions
+        return sorted(candidates.values(), key=lambda m: positions[m.id])
 
     def get_all_memories(self) -> List[Memory]:
         """Get all memories."""
         return self.memories.copy()
 
+    def count(self) -> int:
+        """Get the total number of memories."""
+        return len(self.memories)
+
+    def count_by_type(self) -> Dict[str, int]:
+        """Get the number of memories of each type."""
+        return {t: len(memories) for t, memories in self._by_type.items()}
+
     def get_memories_by_type(self, memory_type: str) -> List[Memory]:
         """Get memories of a specific type."""
-        return [m for m in self.memories if m.type == memory_type]
+        return list(self._by_type.get(memory_type, {}).values())
 
     def get_memories_by_tag(self, tag: str) -> List[Memory]:
         """Get memories with a specific tag."""
-        return [m for m in self.memories if tag in m.tags]
+        return list(self._by_tag.get(tag, {}).values())
+
+    def get_top_memories(self, attribute: str, limit: int = 5) -> List[Memory]:
+        """Get the memories with the highest value of a numeric attribute."""
+        return heapq.nlargest(limit, self.memories, key=lambda m: getattr(m, attribute))
+
+    def get_recent_memories(
+        self,
+        limit: int = 10,
+        memory_type: Optional[str] = None,
+        tag: Optional[str] = None
+    ) -> List[Memory]:
+        """Get the most recently created memories, optionally filtered by type or tag."""
+        if memory_type:
+            candidates = self._by_type.get(memory_type, {}).values()
+        elif tag:
+            candidates = self._by_tag.get(tag, {}).values()
+        else:
+            # Memories are only ever appended and created_at never changes,
+            # so the list is already in creation order
+            return self.memories[-limit:][::-1] if limit > 0 else []
+        # update_memory re-inserts into the grouped indices, so their order
+        # is not creation order; take the top few without a full sort
+        return heapq.nlargest(limit, candidates, key=lambda m: m.created_at)
 
     def get_memories_by_model(self, model_id: str) -> List[Memory]:
         """Get memories related to a specific model."""
-        return [m for m in self.memories if model_id in m.related_models]
+        return list(self._by_model.get(model_id, {}).values())
 
     def record_access(self, memory_id: str):
         """Record that a memory was accessed."""
-        for i, memory in enumerate(self.memories):
-            if memory.id == memory_id:
+        with self._saver.lock:
+            memory = self._by_id.get(memory_id)
+            if memory is not None:
                 memory.access_count += 1
                 memory.last_accessed = datetime.utcnow().isoformat()
-                self._save_memories()
-                return
-
-    def get_recent_memories(self, limit: int = 10) -> List[Memory]:
-        """Get the most recent memories."""
-        sorted_memories = sorted(
-            self.memories,
-            key=lambda m: m.created_at,
-            reverse=True
-        )
-        return sorted_memories[:limit]
+                self._saver.mark_dirty()
 
     def get_important_memories(self, min_importance: float = 0.7) -> List[Memory]:
         """Get memories above a certain importance threshold."""
@@ -183,17 +340,25 @@ class MemoryStore:
 
     def clear_all(self):
         """Clear all memories (use with caution)."""
-        self.memories = []
-        self._save_memories()
+        with self._saver.lock:
+            self.memories = []
+            self._rebuild_indices()
+            self.generation += 1
+        self._saver.flush(force=True)
 
 
 # Singleton instance
 _memory_store: Optional[MemoryStore] = None
+_memory_store_lock = threading.Lock()
 
 
 def get_memory_store() -> MemoryStore:
     """Get the singleton memory store instance."""
     global _memory_store
+    # Double-checked so concurrent first calls can't build two instances
+    # that then overwrite each other's file
     if _memory_store is None:
-        _memory_store = MemoryStore()
+        with _memory_store_lock:
+            if _memory_store is None:
+                _memory_store = MemoryStore()
     return _memory_store
@@ -1,11 +1,15 @@
 """Multimodal support for image inputs."""
 
-from .storage import store_image, get_image, delete_image, cleanup_old_images
+from .storage import store_image, store_image_stream, get_image, get_images, get_image_bytes, get_data_url, delete_image, cleanup_old_images
 from .processor import prepare_multimodal_messages, is_vision_capable
 
 __all__ = [
     'store_image',
+    'store_image_stream',
     'get_image',
+    'get_images',
+    'get_image_bytes',
+    'get_data_url',
     'delete_image',
     'cleanup_old_images',
     'prepare_multimodal_messages',
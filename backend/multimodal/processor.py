@@ -1,11 +1,11 @@
 """Process multimodal messages for different models."""
 
 from typing import List, Dict, Any, Optional
-from .storage import StoredImage, get_image, get_data_url
+from .storage import StoredImage, get_images, get_data_url
 
 
 # Models that support vision/image inputs
-VISION_CAPABLE_MODELS = {
+VISION_CAPABLE_MODELS = frozenset({
     'openai/gpt-4o',
     'openai/gpt-4o-mini',
     'anthropic/claude-sonnet-4.5',
@@ -13,20 +13,11 @@ VISION_CAPABLE_MODELS = {
     'google/gemini-2.5-pro',
     'google/gemini-2.5-flash',
     'x-ai/grok-2',
-}
+})
 
-
-def is_vision_capable(model: str) -> bool:
-    """
-    Check if a model supports vision/image inputs.
-
-    Args:
-        model: OpenRouter model identifier
-
-    Returns:
-        True if model supports images
-    """
-    return model in VISION_CAPABLE_MODELS
+# is_vision_capable(model) -> True if the OpenRouter model accepts images.
+# Bound to the frozenset's C-level membership test: no Python frame per call.
+is_vision_capable = VISION_CAPABLE_MODELS.__contains__
 
 
 def prepare_multimodal_messages(
@@ -51,53 +42,55 @@ def prepare_multimodal_messages(
     if not image_ids:
         return messages
 
-    # Get the images
-    images = []
-    for image_id in image_ids:
-        image = get_image(image_id)
-        if image:
-            images.append(image)
+    # Get the images, reading the metadata file once
+    images = get_images(image_ids)
 
     if not images:
         return messages
 
     # Find the last user message to modify
-    modified_messages = messages.copy()
-
-    for i in range(len(modified_messages) - 1, -1, -1):
-        if modified_messages[i].get('role') == 'user':
-            original_content = modified_messages[i].get('content', '')
-
-            if is_vision_capable(model):
-                # Create multimodal content array
-                content_parts = [
-                    {"type": "text", "text": original_content}
-                ]
-
-                for image in images:
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {
-                            "url": get_data_url(image),
-                            "detail": "auto"
-                        }
-                    })
-
-                modified_messages[i] = {
-                    "role": "user",
-                    "content": content_parts
-                }
-            else:
-                # For text-only models, add a note about the images
-                image_note = f"\n\n[Note: The user has also provided {len(images)} image(s) with this query, but this model cannot view images. Please respond based on the text content only.]"
-                modified_messages[i] = {
-                    "role": "user",
-                    "content": original_content + image_note
+    idx = next(
+        (i for i in range(len(messages) - 1, -1, -1) if messages[i].get('role') == 'user'),
+        None
+    )
+    if idx is None:
+        return messages
+
+    original_content = messages[idx].get('content', '')
+
+    if is_vision_capable(model):
+        # Create multimodal content array
+        content_parts = [
+            {"type": "text", "text": original_content}
+        ]
+
+        for image in images:
+            data_url = get_data_url(image)
+            if data_url is None:
+                # Image file is gone; skip it rather than fail the request
+                continue
+            content_parts.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": data_url,
+                    "detail": "auto"
                 }
+            })
 
-            break
+        new_message = {
+            "role": "user",
+            "content": content_parts
+        }
+    else:
+        # For text-only models, add a note about the images
+        image_note = f"\n\n[Note: The user has also provided {len(images)} image(s) with this query, but this model cannot view images. Please respond based on the text content only.]"
+        new_message = {
+            "role": "user",
+            "content": original_content + image_note
+        }
 
-    return modified_messages
+    # Copy the list only now that one message actually changes
+    return messages[:idx] + [new_message] + messages[idx + 1:]
 
 
 def get_image_summary(image_ids: List[str]) -> str:
@@ -110,11 +103,7 @@ def get_image_summary(image_ids: List[str]) -> str:
     Returns:
         Summary string
     """
-    images = []
-    for image_id in image_ids:
-        image = get_image(image_id)
-        if image:
-            images.append(image)
+    images = get_images(image_ids)
 
     if not images:
         return ""
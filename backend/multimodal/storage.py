@@ -3,30 +3,59 @@
 import os
 import uuid
 import base64
-import json
+import shutil
+import threading
+import orjson
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, BinaryIO, List
 from dataclasses import dataclass, asdict
 
 from ..config import data_path
+from ..memory.persistence import atomic_write_bytes, load_json
 
 
 UPLOAD_DIR = Path(data_path("uploads"))
 METADATA_FILE = UPLOAD_DIR / "metadata.json"
 MAX_AGE_HOURS = 24  # Images expire after 24 hours
 MAX_SIZE_MB = 10  # Maximum image size
+MAX_SIZE_BYTES = MAX_SIZE_MB * 1024 * 1024
+ALLOWED_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+
+# The same images are sent to every council model in a round; keep the
+# encoded data URLs of the most recent few instead of re-encoding per model
+DATA_URL_CACHE_SIZE = 8
+_data_url_cache: "OrderedDict[str, str]" = OrderedDict()
+_data_url_lock = threading.Lock()
+
+# Uploads are stored from worker threads; every metadata load -> edit -> save
+# runs under this lock so concurrent requests don't drop each other's records
+_metadata_lock = threading.Lock()
+
+
+def _image_path(image_id: str) -> Path:
+    """Get the path of an image's raw bytes."""
+    return UPLOAD_DIR / f"{image_id}.bin"
 
 
 @dataclass
 class StoredImage:
-    """Represents a stored image."""
+    """Represents a stored image; the bytes live next to the metadata file."""
     id: str
     filename: str
     content_type: str
     size_bytes: int
     created_at: str
-    base64_data: str
+    digest: Optional[str] = None  # blake2b of the raw bytes
+
+    @property
+    def base64_data(self) -> Optional[str]:
+        """Base64 of the image bytes, read from disk on access; None if the file is missing."""
+        data = get_image_bytes(self)
+        if data is None:
+            return None
+        return base64.b64encode(data).decode('ascii')
 
 
 def _ensure_upload_dir():
@@ -35,21 +64,29 @@ def _ensure_upload_dir():
 
 
 def _load_metadata() -> Dict[str, Any]:
-    """Load metadata from JSON file."""
-    if METADATA_FILE.exists():
-        try:
-            with open(METADATA_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {"images": {}}
-    return {"images": {}}
+    """Load metadata from JSON file, or its backup; the caller holds _metadata_lock."""
+    metadata = load_json(METADATA_FILE)
+    if metadata is None:
+        return {"images": {}}
+    _migrate_inline_images(metadata)
+    return metadata
+
+
+def _migrate_inline_images(metadata: Dict[str, Any]):
+    """Move base64 data left in metadata by older versions out to files."""
+    migrated = False
+    for image_id, image_data in metadata.get("images", {}).items():
+        base64_data = image_data.pop("base64_data", None)
+        if base64_data is not None:
+            _image_path(image_id).write_bytes(base64.b64decode(base64_data))
+            migrated = True
+    if migrated:
+        _save_metadata(metadata)
 
 
 def _save_metadata(metadata: Dict[str, Any]):
-    """Save metadata to JSON file."""
-    _ensure_upload_dir()
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    """Save metadata to JSON file; the caller holds _metadata_lock."""
+    atomic_write_bytes(METADATA_FILE, orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
 
 
 def store_image(
@@ -71,19 +108,18 @@ def store_image(
     _ensure_upload_dir()
 
     # Validate size
-    if len(content) > MAX_SIZE_MB * 1024 * 1024:
+    if len(content) > MAX_SIZE_BYTES:
         return None
 
     # Validate content type
-    allowed_types = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
-    if content_type not in allowed_types:
+    if content_type not in ALLOWED_TYPES:
         return None
 
     # Generate unique ID
     image_id = str(uuid.uuid4())
 
-    # Convert to base64
-    base64_data = base64.b64encode(content).decode('utf-8')
+    # Write the raw bytes; metadata only keeps the record
+    _image_path(image_id).write_bytes(content)
 
     # Create stored image record
     stored_image = StoredImage(
@@ -91,14 +127,60 @@ def store_image(
         filename=filename,
         content_type=content_type,
         size_bytes=len(content),
-        created_at=datetime.utcnow().isoformat(),
-        base64_data=base64_data
+        created_at=datetime.utcnow().isoformat()
     )
 
     # Save metadata
-    metadata = _load_metadata()
-    metadata["images"][image_id] = asdict(stored_image)
-    _save_metadata(metadata)
+    with _metadata_lock:
+        metadata = _load_metadata()
+        metadata["images"][image_id] = asdict(stored_image)
+        _save_metadata(metadata)
+
+    return stored_image
+
+
+def store_image_stream(
+    fp: BinaryIO,
+    size: int,
+    digest: str,
+    filename: str,
+    content_type: str
+) -> Optional[StoredImage]:
+    """
+    Store an image that was already spooled to a file by the caller.
+
+    Args:
+        fp: File object positioned anywhere; it is rewound before reading
+        size: Number of bytes written to fp
+        digest: Hex digest of the content
+        filename: Original filename
+        content_type: MIME type (e.g., "image/jpeg")
+
+    Returns:
+        StoredImage object or None if failed
+    """
+    if size > MAX_SIZE_BYTES or content_type not in ALLOWED_TYPES:
+        return None
+
+    _ensure_upload_dir()
+
+    stored_image = StoredImage(
+        id=str(uuid.uuid4()),
+        filename=filename,
+        content_type=content_type,
+        size_bytes=size,
+        created_at=datetime.utcnow().isoformat(),
+        digest=digest
+    )
+
+    fp.seek(0)
+    with open(_image_path(stored_image.id), 'wb') as out:
+        shutil.copyfileobj(fp, out)
+
+    with _metadata_lock:
+        metadata = _load_metadata()
+        metadata["images"][stored_image.id] = asdict(stored_image)
+        _save_metadata(metadata)
 
     return stored_image
 
@@ -113,7 +195,8 @@ def get_image(image_id: str) -> Optional[StoredImage]:
     Returns:
         StoredImage object or None if not found
     """
-    metadata = _load_metadata()
+    with _metadata_lock:
+        metadata = _load_metadata()
     image_data = metadata.get("images", {}).get(image_id)
 
     if image_data:
@@ -121,6 +204,24 @@ def get_image(image_id: str) -> Optional[StoredImage]:
     return None
 
 
+def get_images(image_ids: List[str]) -> List[StoredImage]:
+    """
+    Retrieve several stored images with a single metadata read.
+
+    Args:
+        image_ids: The image IDs; unknown ones are skipped
+
+    Returns:
+        StoredImage objects for the IDs that exist, in the given order
+    """
+    with _metadata_lock:
+        images = _load_metadata().get("images", {})
+    return [
+        StoredImage(**images[image_id])
+        for image_id in image_ids if image_id in images
+    ]
+
+
 def delete_image(image_id: str) -> bool:
     """
     Delete a stored image.
@@ -131,12 +232,15 @@ def delete_image(image_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    metadata = _load_metadata()
-    if image_id in metadata.get("images", {}):
+    with _metadata_lock:
+        metadata = _load_metadata()
+        if image_id not in metadata.get("images", {}):
+            return False
         del metadata["images"][image_id]
         _save_metadata(metadata)
-        return True
-    return False
+    _image_path(image_id).unlink(missing_ok=True)
+    _forget_data_url(image_id)
+    return True
 
 
 def cleanup_old_images() -> int:
@@ -146,25 +250,31 @@ def cleanup_old_images() -> int:
     Returns:
         Number of images removed
     """
-    metadata = _load_metadata()
-    cutoff = datetime.utcnow() - timedelta(hours=MAX_AGE_HOURS)
+    # created_at is a naive UTC isoformat() string, which orders the same
+    # lexicographically as chronologically, so no per-image parsing is needed
+    cutoff = (datetime.utcnow() - timedelta(hours=MAX_AGE_HOURS)).isoformat()
 
-    to_delete = []
-    for image_id, image_data in metadata.get("images", {}).items():
-        created = datetime.fromisoformat(image_data["created_at"])
-        if created < cutoff:
-            to_delete.append(image_id)
+    with _metadata_lock:
+        metadata = _load_metadata()
+        to_delete = [
+            image_id for image_id, image_data in metadata.get("images", {}).items()
+            if image_data["created_at"] < cutoff
+        ]
 
-    for image_id in to_delete:
-        del metadata["images"][image_id]
+        for image_id in to_delete:
+            del metadata["images"][image_id]
 
-    if to_delete:
-        _save_metadata(metadata)
+        if to_delete:
+            _save_metadata(metadata)
+
+    for image_id in to_delete:
+        _image_path(image_id).unlink(missing_ok=True)
+        _forget_data_url(image_id)
 
     return len(to_delete)
 
 
-def get_data_url(image: StoredImage) -> str:
+def get_data_url(image: StoredImage) -> Optional[str]:
     """
     Get the data URL for an image.
 
@@ -172,6 +282,46 @@ def get_data_url(image: StoredImage) -> str:
         image: StoredImage object
 
     Returns:
-        Data URL string for use in API calls
+        Data URL string for use in API calls, or None if the image file is missing
     """
-    return f"data:{image.content_type};base64,{image.base64_data}"
+    with _data_url_lock:
+        data_url = _data_url_cache.get(image.id)
+        if data_url is not None:
+            _data_url_cache.move_to_end(image.id)
+            return data_url
+
+    data = get_image_bytes(image)
+    if data is None:
+        return None
+
+    # Encode straight from the raw bytes; one copy into the final string
+    data_url = f"data:{image.content_type};base64," + base64.b64encode(data).decode('ascii')
+
+    with _data_url_lock:
+        _data_url_cache[image.id] = data_url
+        if len(_data_url_cache) > DATA_URL_CACHE_SIZE:
+            _data_url_cache.popitem(last=False)
+    return data_url
+
+
+def _forget_data_url(image_id: str):
+    """Drop a deleted image's cached data URL."""
+    with _data_url_lock:
+        _data_url_cache.pop(image_id, None)
+
+
+def get_image_bytes(image: StoredImage) -> Optional[bytes]:
+    """
+    Get the raw bytes of an image.
+
+    Args:
+        image: StoredImage object
+
+    Returns:
+        Raw image bytes, or None if the file is missing (e.g. metadata
+        restored from the backup after its image file was removed)
+    """
+    try:
+        return _image_path(image.id).read_bytes()
+    except FileNotFoundError:
+        return None
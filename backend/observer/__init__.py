@@ -2,6 +2,7 @@
 
 from .analyzer import (
     run_meta_analysis,
+    run_meta_analysis_batch,
     analyze_deliberation_quality,
     get_analysis_history
 )
@@ -18,6 +19,7 @@ from .reporter import (
 
 __all__ = [
     'run_meta_analysis',
+    'run_meta_analysis_batch',
     'analyze_deliberation_quality',
     'get_analysis_history',
     'detect_biases',
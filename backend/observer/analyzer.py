@@ -1,83 +1,257 @@
 """Meta-analysis of council deliberations."""
 
-import json
+import copy
+import hashlib
 import os
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import orjson
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, List, Any, Optional
 from datetime import datetime
+from bisect import bisect_right
+from itertools import combinations, islice
 from pathlib import Path
 from ..config import OBSERVER_CONFIG, data_path
-from .bias_detector import detect_biases
+from .bias_detector import detect_biases, prepare_response_texts, phrase_pattern, ResponseText
+
+
+# Analyses kept on disk and in memory
+MAX_ANALYSES = 500
+# Appends allowed before the file is rewritten down to MAX_ANALYSES lines
+COMPACT_AFTER_LINES = 2 * MAX_ANALYSES
+
+# (epoch second, its ISO string) for utc_timestamp; replaced as a whole
+# tuple so concurrent callers never see a mismatched pair
+_timestamp_cache = (0, '')
+
+
+def utc_timestamp() -> str:
+    """
+    Get the current UTC time as an ISO string, to the second.
+
+    The string is formatted once per second and reused, since observer
+    timestamps are only shown to users.
+
+    Returns:
+        ISO 8601 timestamp without fractional seconds
+    """
+    global _timestamp_cache
+    second = time.time_ns() // 1_000_000_000
+    cached_second, cached = _timestamp_cache
+    if second != cached_second:
+        cached = datetime.utcfromtimestamp(second).isoformat()
+        _timestamp_cache = (second, cached)
+    return cached
 
 
 class AnalysisStore:
-    """Stores analysis results."""
+    """
+    Stores analysis results as an append-only JSON Lines file.
+
+    The history is read on first use by a read method; adding an analysis
+    before that only appends to the file. Analyses are added from worker
+    threads and read from the event loop, so every public method holds
+    the store's lock.
+    """
 
     def __init__(self, storage_path: str = None):
-        self.storage_path = storage_path or data_path("observer", "analyses.json")
-        self.analyses: List[Dict[str, Any]] = []
+        self.storage_path = storage_path or data_path("observer", "analyses.jsonl")
+        # Oldest first; appending past MAX_ANALYSES drops the oldest
+        self.analyses: Deque[Dict[str, Any]] = deque(maxlen=MAX_ANALYSES)
+        # conversation id -> its most recent analysis in self.analyses
+        self._by_conversation: Dict[str, Dict[str, Any]] = {}
+        self._lines_on_disk = 0
+        self._loaded = False
+        self._tail_checked = False
+        self._lock = threading.RLock()
         self._ensure_storage_dir()
-        self._load_analyses()
 
     def _ensure_storage_dir(self):
         """Ensure storage directory exists."""
         Path(os.path.dirname(self.storage_path)).mkdir(parents=True, exist_ok=True)
 
+    def _ensure_loaded(self):
+        """Load the stored analyses if that has not happened yet; the caller holds the lock."""
+        if self._loaded:
+            return
+        try:
+            self._load_analyses()
+        except BaseException:
+            # Stay unloaded, with nothing half-read, so the next call retries
+            self.analyses.clear()
+            self._by_conversation = {}
+            raise
+        self._loaded = True
+
     def _load_analyses(self):
         """Load analyses from storage."""
-        if os.path.exists(self.storage_path):
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    self.analyses = data.get('analyses', [])
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"Error loading analyses: {e}")
-
-    def _save_analyses(self):
-        """Save analyses to storage."""
-        self._ensure_storage_dir()
-        data = {
-            'version': '1.0',
-            'last_updated': datetime.utcnow().isoformat(),
-            'analyses': self.analyses[-500:]  # Keep last 500
+        if not os.path.exists(self.storage_path):
+            self._migrate_legacy_store()
+            return
+
+        damaged = False
+        self._lines_on_disk = 0
+        with open(self.storage_path, 'rb') as f:
+            for line in f:
+                self._lines_on_disk += 1
+                try:
+                    self.analyses.append(orjson.loads(line))
+                except orjson.JSONDecodeError as e:
+                    # e.g. a line cut short by a crash mid-append
+                    print(f"Skipping unreadable analysis: {e}")
+                    damaged = True
+
+        # Rewrite so the next append doesn't land on a partial line, or to
+        # drop lines appended before the history was loaded
+        if damaged or self._lines_on_disk >= COMPACT_AFTER_LINES:
+            self._rewrite_analyses()
+        else:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Rebuild the conversation index from the in-memory analyses."""
+        # Later analyses overwrite earlier ones for the same conversation
+        self._by_conversation = {
+            analysis.get('conversation_id'): analysis for analysis in self.analyses
         }
-        with open(self.storage_path, 'w') as f:
-            json.dump(data, f, indent=2)
+
+    def _migrate_legacy_store(self):
+        """Convert the single-document analyses.json written by older versions."""
+        legacy_path = os.path.splitext(self.storage_path)[0] + '.json'
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'rb') as f:
+                self.analyses = deque(
+                    orjson.loads(f.read()).get('analyses', []), maxlen=MAX_ANALYSES
+                )
+        except (orjson.JSONDecodeError, AttributeError) as e:
+            print(f"Error loading analyses: {e}")
+            return
+        self._rewrite_analyses()
+
+    def _rewrite_analyses(self):
+        """Rewrite the file with only the most recent analyses."""
+        self._ensure_storage_dir()
+        self._rebuild_index()
+        tmp_path = self.storage_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.writelines(orjson.dumps(a, option=orjson.OPT_APPEND_NEWLINE) for a in self.analyses)
+        os.replace(tmp_path, self.storage_path)
+        self._lines_on_disk = len(self.analyses)
+
+    def _terminate_partial_line(self):
+        """End a last line left unterminated by a crash, before appending after it."""
+        with open(self.storage_path, 'rb+') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def _append_analyses(self, analyses: List[Dict[str, Any]]):
+        """Append one line per analysis to the file, in a single write."""
+        with open(self.storage_path, 'ab') as f:
+            f.write(b''.join(orjson.dumps(a, option=orjson.OPT_APPEND_NEWLINE) for a in analyses))
+        self._lines_on_disk += len(analyses)
 
     def add_analysis(self, analysis: Dict[str, Any]):
         """Add an analysis result."""
-        self.analyses.append(analysis)
-        self._save_analyses()
+        self.add_analyses([analysis])
+
+    def add_analyses(self, analyses: List[Dict[str, Any]]):
+        """Add several analysis results, in order, with one file write."""
+        if not analyses:
+            return
+
+        with self._lock:
+            if not self._loaded:
+                if not os.path.exists(self.storage_path):
+                    # Nothing to read, or an old analyses.json to convert first
+                    self._ensure_loaded()
+                else:
+                    # Append without reading the history; it is loaded (and
+                    # compacted if needed) when something asks for it
+                    if not self._tail_checked:
+                        self._tail_checked = True
+                        self._terminate_partial_line()
+                    self._append_analyses(analyses)
+                    if self._lines_on_disk >= COMPACT_AFTER_LINES:
+                        self._ensure_loaded()
+                    return
+
+            for analysis in analyses:
+                if len(self.analyses) == MAX_ANALYSES:
+                    # The append below drops the oldest analysis; unindex it unless
+                    # a later analysis of its conversation has taken its place
+                    oldest = self.analyses[0]
+                    if self._by_conversation.get(oldest.get('conversation_id')) is oldest:
+                        del self._by_conversation[oldest.get('conversation_id')]
+                self.analyses.append(analysis)
+                self._by_conversation[analysis.get('conversation_id')] = analysis
+
+            # Append the new lines; only rewrite once old lines would pile up
+            if self._lines_on_disk + len(analyses) > COMPACT_AFTER_LINES:
+                self._rewrite_analyses()
+                return
+            self._append_analyses(analyses)
 
     def get_analyses(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent analyses."""
-        return self.analyses[-limit:]
+        with self._lock:
+            self._ensure_loaded()
+            start = max(len(self.analyses) - limit, 0)
+            return list(islice(self.analyses, start, None))
 
     def get_analysis_for_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Get analysis for a specific conversation."""
-        for analysis in reversed(self.analyses):
-            if analysis.get('conversation_id') == conversation_id:
-                return analysis
-        return None
+        with self._lock:
+            self._ensure_loaded()
+            return self._by_conversation.get(conversation_id)
 
 
 # Singleton instance
 _analysis_store: Optional[AnalysisStore] = None
+_analysis_store_lock = threading.Lock()
 
 
 def get_analysis_store() -> AnalysisStore:
     """Get the singleton analysis store."""
     global _analysis_store
+    # Double-checked so concurrent first calls can't build two instances
+    # appending to the same file
     if _analysis_store is None:
-        _analysis_store = AnalysisStore()
+        with _analysis_store_lock:
+            if _analysis_store is None:
+                _analysis_store = AnalysisStore()
     return _analysis_store
 
 
-def analyze_response_diversity(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+# Words that show an evaluation explains its ranking
+_REASONING_RE = phrase_pattern([
+    'because', 'since', 'therefore', 'however', 'although',
+    'strength', 'weakness', 'better', 'worse', 'prefer'
+])
+
+# Phrases that show a synthesis weighs the responses against each other;
+# each distinct one found counts, so they are tested individually
+_SYNTHESIS_INDICATORS = (
+    'overall', 'considering', 'combining', 'consensus', 'majority',
+    'agree', 'disagree', 'different perspectives', 'synthesizing'
+)
+
+
+def analyze_response_diversity(
+    responses: List[Dict[str, Any]],
+    texts: Optional[List[ResponseText]] = None
+) -> Dict[str, Any]:
     """
     Analyze diversity of responses.
 
     Args:
         responses: Stage 1 responses
+        texts: Prepared response texts, if already computed
 
     Returns:
         Diversity metrics
@@ -85,26 +259,23 @@ def analyze_response_diversity(responses: List[Dict[str, Any]]) -> Dict[str, Any
     if not responses:
         return {'diversity_score': 0, 'unique_approaches': 0}
 
-    # Extract content
-    contents = [r.get('content', '') for r in responses]
+    if texts is None:
+        texts = prepare_response_texts(responses)
 
-    # Calculate word overlap between pairs
-    word_sets = [set(c.lower().split()) for c in contents]
+    # Calculate word overlap between pairs; empty responses are left out
+    word_sets = [t.word_set for t in texts if t.word_set]
     overlaps = []
 
-    for i in range(len(word_sets)):
-        for j in range(i + 1, len(word_sets)):
-            if word_sets[i] and word_sets[j]:
-                intersection = len(word_sets[i] & word_sets[j])
-                union = len(word_sets[i] | word_sets[j])
-                overlap = intersection / union if union > 0 else 0
-                overlaps.append(overlap)
+    for set_a, set_b in combinations(word_sets, 2):
+        # |A | B| = |A| + |B| - |A & B|, so no union set is built per pair
+        intersection = len(set_a & set_b)
+        overlaps.append(intersection / (len(set_a) + len(set_b) - intersection))
 
     avg_overlap = sum(overlaps) / len(overlaps) if overlaps else 0
     diversity_score = 1 - avg_overlap
 
     # Count unique approaches (based on response length distribution)
-    lengths = [len(c) for c in contents]
+    lengths = [t.length for t in texts]
     avg_length = sum(lengths) / len(lengths) if lengths else 0
     length_variance = sum((l - avg_length) ** 2 for l in lengths) / len(lengths) if lengths else 0
 
@@ -133,16 +304,11 @@ def analyze_ranking_quality(rankings: List[Dict[str, Any]]) -> Dict[str, Any]:
     evaluation_lengths = []
     has_reasoning = 0
 
-    reasoning_indicators = [
-        'because', 'since', 'therefore', 'however', 'although',
-        'strength', 'weakness', 'better', 'worse', 'prefer'
-    ]
-
     for ranking in rankings:
         content = ranking.get('content', '')
         evaluation_lengths.append(len(content))
 
-        if any(ind in content.lower() for ind in reasoning_indicators):
+        if _REASONING_RE.search(content.lower()):
             has_reasoning += 1
 
     avg_length = sum(evaluation_lengths) / len(evaluation_lengths) if evaluation_lengths else 0
@@ -156,8 +322,9 @@ def analyze_ranking_quality(rankings: List[Dict[str, Any]]) -> Dict[str, Any]:
         # Check agreement on top choice
         first_choices = [r[0] if r else None for r in parsed_rankings]
         if first_choices:
-            most_common = max(set(first_choices), key=first_choices.count)
-            agreement = first_choices.count(most_common) / len(first_choices)
+            # One counting pass instead of a list.count() per distinct choice
+            _, top_count = Counter(first_choices).most_common(1)[0]
+            agreement = top_count / len(first_choices)
             consistency = agreement
 
     quality_score = (reasoning_ratio * 0.5) + (min(avg_length / 500, 1) * 0.3) + (consistency * 0.2)
@@ -173,7 +340,8 @@ def analyze_ranking_quality(rankings: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 def analyze_synthesis_completeness(
     synthesis: str,
-    responses: List[Dict[str, Any]]
+    responses: List[Dict[str, Any]],
+    texts: Optional[List[ResponseText]] = None
 ) -> Dict[str, Any]:
     """
     Analyze how well the synthesis incorporates all responses.
@@ -181,6 +349,7 @@ def analyze_synthesis_completeness(
     Args:
         synthesis: Stage 3 synthesis
         responses: Stage 1 responses
+        texts: Prepared response texts, if already computed
 
     Returns:
         Synthesis completeness metrics
@@ -194,25 +363,24 @@ def analyze_synthesis_completeness(
     incorporated = 0
     key_concepts = []
 
-    for response in responses:
-        content = response.get('content', '')
-        # Extract key phrases (simple: longer words)
-        words = content.split()
-        key_words = [w.lower() for w in words if len(w) > 7][:10]
+    if texts is None:
+        texts = prepare_response_texts(responses)
 
-        # Check if any key words appear in synthesis
-        if any(kw in synthesis_lower for kw in key_words):
+    for text in texts:
+        # Key phrases (simple: longer words) that appear in the synthesis;
+        # one scan per word decides incorporation and collects the concepts
+        found = [kw for kw in text.key_words if kw in synthesis_lower]
+        if found:
             incorporated += 1
-            key_concepts.extend([kw for kw in key_words if kw in synthesis_lower])
+            key_concepts.extend(found)
 
     incorporation_ratio = incorporated / len(responses) if responses else 0
 
     # Check for synthesis-specific indicators
-    synthesis_indicators = [
-        'overall', 'considering', 'combining', 'consensus', 'majority',
-        'agree', 'disagree', 'different perspectives', 'synthesizing'
-    ]
-    synthesis_quality = sum(1 for ind in synthesis_indicators if ind in synthesis_lower) / len(synthesis_indicators)
+    synthesis_quality = (
+        sum(1 for ind in _SYNTHESIS_INDICATORS if ind in synthesis_lower)
+        / len(_SYNTHESIS_INDICATORS)
+    )
 
     completeness_score = (incorporation_ratio * 0.6) + (synthesis_quality * 0.4)
 
@@ -226,6 +394,27 @@ def analyze_synthesis_completeness(
     }
 
 
+# The analyze, report and health endpoints all analyze the same stage data;
+# keep recent results keyed by a digest of the inputs
+ANALYSIS_CACHE_SIZE = 128
+_analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def _analysis_key(
+    responses: List[Dict[str, Any]],
+    rankings: List[Dict[str, Any]],
+    synthesis: Optional[str],
+    query: Optional[str]
+) -> Optional[str]:
+    """Get a digest of the analysis inputs, or None if they are not JSON-serializable."""
+    try:
+        payload = orjson.dumps([responses, rankings, synthesis, query])
+    except TypeError:
+        return None
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 def analyze_deliberation_quality(
     responses: List[Dict[str, Any]],
     rankings: List[Dict[str, Any]],
@@ -244,10 +433,23 @@ def analyze_deliberation_quality(
     Returns:
         Complete quality analysis
     """
-    diversity = analyze_response_diversity(responses)
+    key = _analysis_key(responses, rankings, synthesis, query)
+    if key is not None:
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(key)
+            if cached is not None:
+                _analysis_cache.move_to_end(key)
+        if cached is not None:
+            # Callers add to and store the result; hand out a private copy
+            return {**copy.deepcopy(cached), 'analyzed_at': utc_timestamp()}
+
+    # One pass over the responses, shared by every analysis and detector
+    texts = prepare_response_texts(responses)
+
+    diversity = analyze_response_diversity(responses, texts)
     ranking_quality = analyze_ranking_quality(rankings)
-    synthesis_completeness = analyze_synthesis_completeness(synthesis, responses) if synthesis else None
-    biases = detect_biases(responses, rankings, query)
+    synthesis_completeness = analyze_synthesis_completeness(synthesis, responses, texts) if synthesis else None
+    biases = detect_biases(responses, rankings, query, texts)
 
     # Calculate overall quality score
     scores = [
@@ -261,29 +463,33 @@ def analyze_deliberation_quality(
 
     overall_quality = sum(scores) / len(scores)
 
-    return {
+    analysis = {
         'overall_quality': overall_quality,
         'quality_rating': get_quality_rating(overall_quality),
         'diversity': diversity,
         'ranking_quality': ranking_quality,
         'synthesis_completeness': synthesis_completeness,
-        'bias_analysis': biases,
-        'analyzed_at': datetime.utcnow().isoformat()
+        'bias_analysis': biases
     }
 
+    if key is not None:
+        with _analysis_cache_lock:
+            _analysis_cache[key] = copy.deepcopy(analysis)
+            if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+
+    analysis['analyzed_at'] = utc_timestamp()
+    return analysis
+
+
+# Minimum score for each label above 'Poor'
+_QUALITY_THRESHOLDS = (0.4, 0.6, 0.75, 0.9)
+_QUALITY_LABELS = ('Poor', 'Needs Improvement', 'Satisfactory', 'Good', 'Excellent')
+
 
 def get_quality_rating(score: float) -> str:
     """Get a quality rating label from a score."""
-    if score >= 0.9:
-        return 'Excellent'
-    elif score >= 0.75:
-        return 'Good'
-    elif score >= 0.6:
-        return 'Satisfactory'
-    elif score >= 0.4:
-        return 'Needs Improvement'
-    else:
-        return 'Poor'
+    return _QUALITY_LABELS[bisect_right(_QUALITY_THRESHOLDS, score)]
 
 
 def run_meta_analysis(
@@ -306,8 +512,50 @@ def run_meta_analysis(
     Returns:
         Analysis results
     """
-    store = get_analysis_store()
+    analysis = _build_meta_analysis(conversation_id, responses, rankings, synthesis, query)
+
+    # Store results
+    get_analysis_store().add_analysis(analysis)
+
+    return analysis
+
+
+def run_meta_analysis_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run meta-analysis for several conversations and store the results together.
 
+    Args:
+        items: One dict per conversation with 'conversation_id', 'responses'
+            and 'rankings', and optionally 'synthesis' and 'query'
+
+    Returns:
+        Analysis results, in the order of items
+    """
+    analyses = [
+        _build_meta_analysis(
+            item['conversation_id'],
+            item['responses'],
+            item['rankings'],
+            item.get('synthesis'),
+            item.get('query')
+        )
+        for item in items
+    ]
+
+    # One append for the whole batch instead of one file write per conversation
+    get_analysis_store().add_analyses(analyses)
+
+    return analyses
+
+
+def _build_meta_analysis(
+    conversation_id: str,
+    responses: List[Dict[str, Any]],
+    rankings: List[Dict[str, Any]],
+    synthesis: Optional[str],
+    query: Optional[str]
+) -> Dict[str, Any]:
+    """Analyze one conversation and add its id, query and recommendations."""
     # Run analysis
     analysis = analyze_deliberation_quality(responses, rankings, synthesis, query)
     analysis['conversation_id'] = conversation_id
@@ -317,9 +565,6 @@ def run_meta_analysis(
     recommendations = generate_recommendations(analysis)
     analysis['recommendations'] = recommendations
 
-    # Store results
-    store.add_analysis(analysis)
-
     return analysis
 
 
@@ -390,14 +635,18 @@ def get_aggregate_statistics() -> Dict[str, Any]:
     if not analyses:
         return {'count': 0}
 
-    quality_scores = [a.get('overall_quality', 0) for a in analyses]
-    diversity_scores = [a.get('diversity', {}).get('diversity_score', 0) for a in analyses]
-    bias_counts = [a.get('bias_analysis', {}).get('bias_count', 0) for a in analyses]
+    # One pass with running sums; only the trend needs individual scores
+    total_quality = total_diversity = total_bias = 0
+    for a in analyses:
+        total_quality += a.get('overall_quality', 0)
+        total_diversity += a.get('diversity', {}).get('diversity_score', 0)
+        total_bias += a.get('bias_analysis', {}).get('bias_count', 0)
 
+    count = len(analyses)
     return {
-        'count': len(analyses),
-        'average_quality': sum(quality_scores) / len(quality_scores),
-        'average_diversity': sum(diversity_scores) / len(diversity_scores),
-        'average_bias_count': sum(bias_counts) / len(bias_counts),
-        'quality_trend': quality_scores[-10:] if len(quality_scores) >= 10 else quality_scores
+        'count': count,
+        'average_quality': total_quality / count,
+        'average_diversity': total_diversity / count,
+        'average_bias_count': total_bias / count,
+        'quality_trend': [a.get('overall_quality', 0) for a in analyses[-10:]]
     }
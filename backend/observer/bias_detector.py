@@ -1,6 +1,8 @@
 """Cognitive bias detection for council deliberations."""
 
-from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Any, FrozenSet, NamedTuple, Optional, Set, Tuple
 import re
 
 
@@ -142,9 +144,93 @@ COGNITIVE_BIASES = {
 }
 
 
+class _BiasInfo(NamedTuple):
+    """The parts of a COGNITIVE_BIASES entry used when reporting a detection."""
+    name: str
+    severity: str
+    description: str
+
+
+# Frozen view of COGNITIVE_BIASES, built once at import
+_BIAS_INFO: Dict[str, _BiasInfo] = {
+    bias_type: _BiasInfo(bias['name'], bias['severity'], bias['description'])
+    for bias_type, bias in COGNITIVE_BIASES.items()
+}
+
+
+def _bias_entry(bias_type: str, confidence: float, indicators: List[str]) -> Dict[str, Any]:
+    """Build the detected-bias record for a bias type."""
+    info = _BIAS_INFO[bias_type]
+    return {
+        'type': bias_type,
+        'name': info.name,
+        'confidence': confidence,
+        'severity': info.severity,
+        'indicators': indicators
+    }
+
+
+def phrase_pattern(phrases: List[str]) -> "re.Pattern[str]":
+    """
+    Compile phrases into one alternation, so a single search tells whether
+    any of them occurs in a text.
+
+    Args:
+        phrases: Literal phrases to look for
+
+    Returns:
+        Compiled pattern
+    """
+    return re.compile('|'.join(map(re.escape, phrases)))
+
+
+# Indicator phrases, matched against lower-cased content
+_DISSENT_RE = phrase_pattern(['however', 'alternatively', 'on the other hand', 'disagree', 'different view'])
+_REFERENCE_RE = phrase_pattern(['as mentioned', 'building on', 'similar to', 'agreeing with', 'like the previous'])
+_DISMISSIVE_RE = phrase_pattern(['clearly wrong', 'obviously incorrect', 'no merit', 'completely false'])
+_SELECTIVE_RE = phrase_pattern(['cherry-pick', 'only evidence', 'sole reason', 'single explanation'])
+_COUNTER_RE = phrase_pattern(['counter', 'objection', 'challenge', 'weakness', 'limitation'])
+
+
+@dataclass(frozen=True)
+class ResponseText:
+    """Text features of one response, derived once and shared by the analyses."""
+    lower: str  # Lower-cased content
+    words: List[str]  # lower.split()
+    word_set: FrozenSet[str]
+    length: int  # Length of the original content
+    key_words: List[str]  # First 10 words longer than 7 characters
+
+
+def prepare_response_texts(responses: List[Dict[str, Any]]) -> List[ResponseText]:
+    """
+    Derive every text feature the analyses need in one pass over the responses.
+
+    Args:
+        responses: Stage 1 responses
+
+    Returns:
+        ResponseText for each response, in the same order
+    """
+    texts = []
+    for response in responses:
+        content = response.get('content', '')
+        lower = content.lower()
+        words = lower.split()
+        texts.append(ResponseText(
+            lower=lower,
+            words=words,
+            word_set=frozenset(words),
+            length=len(content),
+            key_words=[w for w in words if len(w) > 7][:10]
+        ))
+    return texts
+
+
 def detect_groupthink(
     responses: List[Dict[str, Any]],
-    rankings: List[Dict[str, Any]]
+    rankings: List[Dict[str, Any]],
+    texts: Optional[List[ResponseText]] = None
 ) -> Tuple[bool, float, List[str]]:
     """
     Detect groupthink in council deliberation.
@@ -152,6 +238,7 @@ def detect_groupthink(
     Args:
         responses: Stage 1 responses
         rankings: Stage 2 rankings
+        texts: Prepared response texts, if already computed
 
     Returns:
         Tuple of (detected, confidence, indicators)
@@ -174,27 +261,32 @@ def detect_groupthink(
                 indicators.append('Unanimous first choice across all evaluators')
                 confidence += 0.3
 
-            # Check ranking similarity (top 3)
-            top_3s = [set(r[:3]) if len(r) >= 3 else set(r) for r in parsed_rankings]
-            if len(top_3s) >= 2:
-                overlap = set.intersection(*top_3s) if top_3s else set()
-                if len(overlap) >= 3:
-                    indicators.append('High overlap in top-ranked responses')
-                    confidence += 0.2
+            # Check ranking similarity (top 3); each label gets one bit, so
+            # the shared top choices are the AND of the per-ranking masks
+            label_bits: Dict[str, int] = {}
+            overlap = -1
+            for r in parsed_rankings:
+                mask = 0
+                for label in r[:3]:
+                    mask |= label_bits.setdefault(label, 1 << len(label_bits))
+                overlap &= mask
+            if overlap.bit_count() >= 3:
+                indicators.append('High overlap in top-ranked responses')
+                confidence += 0.2
 
     # Check response content for similarity
     if responses:
-        contents = [r.get('content', '') for r in responses]
+        if texts is None:
+            texts = prepare_response_texts(responses)
 
         # Simple similarity check: common phrases
-        common_phrases = find_common_phrases(contents)
+        common_phrases = _common_phrases([t.words for t in texts])
         if len(common_phrases) > 5:
             indicators.append('Many common phrases across responses')
             confidence += 0.2
 
         # Check for lack of dissent
-        dissent_indicators = ['however', 'alternatively', 'on the other hand', 'disagree', 'different view']
-        dissent_count = sum(1 for c in contents if any(d in c.lower() for d in dissent_indicators))
+        dissent_count = sum(1 for t in texts if _DISSENT_RE.search(t.lower))
         if dissent_count == 0:
             indicators.append('No dissenting language detected')
             confidence += 0.2
@@ -205,7 +297,8 @@ def detect_groupthink(
 
 def detect_anchoring(
     responses: List[Dict[str, Any]],
-    rankings: List[Dict[str, Any]]
+    rankings: List[Dict[str, Any]],
+    texts: Optional[List[ResponseText]] = None
 ) -> Tuple[bool, float, List[str]]:
     """
     Detect anchoring bias in council deliberation.
@@ -213,6 +306,7 @@ def detect_anchoring(
     Args:
         responses: Stage 1 responses
         rankings: Stage 2 rankings
+        texts: Prepared response texts, if already computed
 
     Returns:
         Tuple of (detected, confidence, indicators)
@@ -242,10 +336,10 @@ def detect_anchoring(
             confidence += 0.3
 
     # Check if later responses reference earlier ones
-    for i, response in enumerate(responses[1:], 1):
-        content = response.get('content', '').lower()
-        reference_phrases = ['as mentioned', 'building on', 'similar to', 'agreeing with', 'like the previous']
-        if any(phrase in content for phrase in reference_phrases):
+    if texts is None:
+        texts = prepare_response_texts(responses)
+    for i, text in enumerate(texts[1:], 1):
+        if _REFERENCE_RE.search(text.lower):
             indicators.append(f'Response {i+1} appears to reference earlier responses')
             confidence += 0.15
 
@@ -255,7 +349,8 @@ def detect_anchoring(
 
 def detect_confirmation_bias(
     responses: List[Dict[str, Any]],
-    query: str = None
+    query: str = None,
+    texts: Optional[List[ResponseText]] = None
 ) -> Tuple[bool, float, List[str]]:
     """
     Detect confirmation bias in council deliberation.
@@ -263,6 +358,7 @@ def detect_confirmation_bias(
     Args:
         responses: Stage 1 responses
         query: Original user query
+        texts: Prepared response texts, if already computed
 
     Returns:
         Tuple of (detected, confidence, indicators)
@@ -273,24 +369,24 @@ def detect_confirmation_bias(
     if not responses:
         return False, 0.0, []
 
-    for response in responses:
-        content = response.get('content', '').lower()
+    if texts is None:
+        texts = prepare_response_texts(responses)
+
+    for text in texts:
+        content = text.lower
 
         # Check for dismissive language
-        dismissive = ['clearly wrong', 'obviously incorrect', 'no merit', 'completely false']
-        if any(phrase in content for phrase in dismissive):
+        if _DISMISSIVE_RE.search(content):
             indicators.append('Dismissive language toward alternative views')
             confidence += 0.2
 
         # Check for selective evidence
-        selective = ['cherry-pick', 'only evidence', 'sole reason', 'single explanation']
-        if any(phrase in content for phrase in selective):
+        if _SELECTIVE_RE.search(content):
             indicators.append('Potentially selective use of evidence')
             confidence += 0.15
 
         # Check for lack of counterarguments
-        counter_indicators = ['counter', 'objection', 'challenge', 'weakness', 'limitation']
-        if not any(c in content for c in counter_indicators):
+        if not _COUNTER_RE.search(content):
             indicators.append('No counterarguments considered')
             confidence += 0.1
 
@@ -312,27 +408,40 @@ def find_common_phrases(texts: List[str], min_words: int = 3) -> List[str]:
     if not texts or len(texts) < 2:
         return []
 
-    # Extract n-grams from first text
-    words = texts[0].lower().split()
-    ngrams = []
-    for n in range(min_words, min_words + 3):
-        for i in range(len(words) - n + 1):
-            ngram = ' '.join(words[i:i+n])
-            ngrams.append(ngram)
+    return _common_phrases([text.lower().split() for text in texts], min_words)
+
+
+def _common_phrases(word_lists: List[List[str]], min_words: int = 3) -> List[str]:
+    """Find the word n-grams shared by every word list (see find_common_phrases)."""
+    if len(word_lists) < 2:
+        return []
+
+    # Intersect hashed word n-gram sets instead of substring-searching
+    # every text for every n-gram of the first one
+    common = _word_ngrams(word_lists[0], min_words)
+    for words in word_lists[1:]:
+        if not common:
+            break
+        common &= _word_ngrams(words, min_words)
+
+    return [' '.join(ngram) for ngram in common]
 
-    # Check which appear in all texts
-    common = []
-    for ngram in ngrams:
-        if all(ngram in text.lower() for text in texts[1:]):
-            common.append(ngram)
 
-    return list(set(common))
+def _word_ngrams(words: List[str], min_words: int) -> Set[Tuple[str, ...]]:
+    """Get the min_words to min_words + 2 word n-grams of a word list."""
+    # zip over offset views yields each n-gram as a tuple directly, with no
+    # per-n-gram slice or tuple() call
+    ngrams = set()
+    for n in range(min_words, min_words + 3):
+        ngrams.update(zip(*(words[k:] for k in range(n))))
+    return ngrams
 
 
 def detect_biases(
     responses: List[Dict[str, Any]],
     rankings: List[Dict[str, Any]],
-    query: str = None
+    query: str = None,
+    texts: Optional[List[ResponseText]] = None
 ) -> Dict[str, Any]:
     """
     Run all bias detection on council deliberation.
@@ -341,6 +450,7 @@ def detect_biases(
         responses: Stage 1 responses
         rankings: Stage 2 rankings
         query: Original user query
+        texts: Prepared response texts, if already computed
 
     Returns:
         Comprehensive bias report
@@ -348,38 +458,24 @@ def detect_biases(
     biases_detected = []
     overall_score = 1.0  # Start with perfect score
 
+    # Derive the response text features once for all detectors
+    if texts is None:
+        texts = prepare_response_texts(responses)
+
     # Run each detector
-    groupthink, gt_conf, gt_ind = detect_groupthink(responses, rankings)
+    groupthink, gt_conf, gt_ind = detect_groupthink(responses, rankings, texts)
     if groupthink:
-        biases_detected.append({
-            'type': 'groupthink',
-            'name': COGNITIVE_BIASES['groupthink']['name'],
-            'confidence': gt_conf,
-            'severity': COGNITIVE_BIASES['groupthink']['severity'],
-            'indicators': gt_ind
-        })
+        biases_detected.append(_bias_entry('groupthink', gt_conf, gt_ind))
         overall_score -= gt_conf * 0.3
 
-    anchoring, anch_conf, anch_ind = detect_anchoring(responses, rankings)
+    anchoring, anch_conf, anch_ind = detect_anchoring(responses, rankings, texts)
     if anchoring:
-        biases_detected.append({
-            'type': 'anchoring',
-            'name': COGNITIVE_BIASES['anchoring']['name'],
-            'confidence': anch_conf,
-            'severity': COGNITIVE_BIASES['anchoring']['severity'],
-            'indicators': anch_ind
-        })
+        biases_detected.append(_bias_entry('anchoring', anch_conf, anch_ind))
         overall_score -= anch_conf * 0.2
 
-    confirmation, conf_conf, conf_ind = detect_confirmation_bias(responses, query)
+    confirmation, conf_conf, conf_ind = detect_confirmation_bias(responses, query, texts)
     if confirmation:
-        biases_detected.append({
-            'type': 'confirmation_bias',
-            'name': COGNITIVE_BIASES['confirmation_bias']['name'],
-            'confidence': conf_conf,
-            'severity': COGNITIVE_BIASES['confirmation_bias']['severity'],
-            'indicators': conf_ind
-        })
+        biases_detected.append(_bias_entry('confirmation_bias', conf_conf, conf_ind))
         overall_score -= conf_conf * 0.3
 
     return {
@@ -390,18 +486,14 @@ def detect_biases(
     }
 
 
+# Health labels from worst to best, and the minimum score for each one above 'Critical'
+_HEALTH_THRESHOLDS = (0.3, 0.5, 0.7, 0.9)
+_HEALTH_LABELS = ('Critical', 'Poor', 'Fair', 'Good', 'Excellent')
+
+
 def get_health_rating(score: float) -> str:
     """Get a health rating label from a score."""
-    if score >= 0.9:
-        return 'Excellent'
-    elif score >= 0.7:
-        return 'Good'
-    elif score >= 0.5:
-        return 'Fair'
-    elif score >= 0.3:
-        return 'Poor'
-    else:
-        return 'Critical'
+    return _HEALTH_LABELS[bisect_right(_HEALTH_THRESHOLDS, score)]
 
 
 def get_bias_report(
@@ -436,7 +528,7 @@ def get_bias_report(
         for bias in results['biases_detected']:
             severity_emoji = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}.get(bias['severity'], '⚪')
             lines.append(f"{severity_emoji} {bias['name']} (Confidence: {bias['confidence']:.0%})")
-            lines.append(f"   {COGNITIVE_BIASES[bias['type']]['description']}")
+            lines.append(f"   {_BIAS_INFO[bias['type']].description}")
             lines.append("   Indicators:")
             for indicator in bias['indicators']:
                 lines.append(f"   • {indicator}")
@@ -1,8 +1,9 @@
 """Report generation for observer analyses."""
 
 from typing import Dict, List, Any, Optional
-from datetime import datetime
-from .analyzer import analyze_deliberation_quality, get_analysis_store, get_aggregate_statistics
+from .analyzer import (
+    analyze_deliberation_quality, get_analysis_store, get_aggregate_statistics, utc_timestamp
+)
 from .bias_detector import detect_biases, get_bias_report, COGNITIVE_BIASES
 
 
@@ -203,7 +204,7 @@ def generate_observer_report(
 
     report = {
         'conversation_id': conversation_id,
-        'generated_at': datetime.utcnow().isoformat(),
+        'generated_at': utc_timestamp(),
         'health': health,
         'observations': observations,
         'analysis': analysis
@@ -1,9 +1,16 @@
 """OpenRouter API client for making LLM requests."""
 
+import asyncio
 import httpx
 import json
+from collections import defaultdict
 from typing import List, Dict, Any, Optional, AsyncGenerator
-from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL, MAX_INFLIGHT_PER_MODEL
+
+# Per-model concurrency caps so concurrent councils don't oversubscribe upstream
+_MODEL_SEMAPHORES: Dict[str, asyncio.Semaphore] = defaultdict(
+    lambda: asyncio.Semaphore(MAX_INFLIGHT_PER_MODEL)
+)
 
 
 async def query_model(
@@ -33,7 +40,7 @@ async def query_model(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with _MODEL_SEMAPHORES[model], httpx.AsyncClient(timeout=timeout) as client:
             response = await client.post(
                 OPENROUTER_API_URL,
                 headers=headers,
@@ -90,7 +97,7 @@ async def query_model_stream(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
+        async with _MODEL_SEMAPHORES[model], httpx.AsyncClient(timeout=timeout) as client:
             async with client.stream(
                 "POST",
                 OPENROUTER_API_URL,
@@ -136,15 +143,19 @@ async def query_models_parallel(
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-    from .multimodal import prepare_multimodal_messages
+    from .multimodal import prepare_multimodal_messages, is_vision_capable
 
-    # Create tasks for all models with multimodal support
+    # Create tasks for all models with multimodal support. The prepared
+    # messages only depend on whether the model can see images, so build
+    # each variant at most once per request.
+    prepared: Dict[bool, List[Dict[str, Any]]] = {}
     tasks = []
     for model in models:
         if image_ids:
-            # Prepare messages with images for this specific model
-            model_messages = prepare_multimodal_messages(messages, image_ids, model)
+            vision = is_vision_capable(model)
+            model_messages = prepared.get(vision)
+            if model_messages is None:
+                model_messages = prepared[vision] = prepare_multimodal_messages(messages, image_ids, model)
         else:
             model_messages = messages
         tasks.append(query_model(model, model_messages))
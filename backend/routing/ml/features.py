@@ -1,10 +1,14 @@
 """Feature extraction for query routing."""
 
 import re
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 
 
+FEATURE_CACHE_SIZE = 4096
+
+
 # Technical domain keywords
 TECHNICAL_KEYWORDS = {
     'code', 'programming', 'algorithm', 'database', 'api', 'function',
@@ -37,7 +41,7 @@ SIMPLE_PATTERNS = [
 ]
 
 
-@dataclass
+@dataclass(frozen=True)
 class QueryFeatures:
     """Extracted features from a query."""
     # Length features
@@ -168,3 +172,20 @@ def extract_features(query: str) -> QueryFeatures:
         nested_clause_count=nested_clause_count,
         conjunction_count=conjunction_count,
     )
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def featurize(query: str) -> Tuple[float, ...]:
+    """
+    Get the numerical feature vector for a query.
+
+    Results are cached, so the feedback for a routed query reuses the
+    vector instead of running the extractors again.
+
+    Args:
+        query: The user's query string
+
+    Returns:
+        Feature vector as a tuple
+    """
+    return tuple(extract_features(query).to_vector())
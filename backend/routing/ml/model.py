@@ -2,7 +2,9 @@
 
 import json
 import os
-from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from operator import mul
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
@@ -11,6 +13,9 @@ from .features import extract_features, QueryFeatures
 from ...config import data_path
 
 
+PREDICTION_CACHE_SIZE = 1024
+
+
 @dataclass
 class RoutingPrediction:
     """Prediction from the routing model."""
@@ -36,6 +41,8 @@ class RoutingModel:
         self.bias: List[float] = [0.0, 0.0, 0.0]  # Bias for each tier
         self.training_samples: int = 0
         self.last_trained: Optional[str] = None
+        # query -> prediction under the current weights; cleared on every update
+        self._prediction_cache: "OrderedDict[str, RoutingPrediction]" = OrderedDict()
         self._ensure_dir()
         self._load_model()
 
@@ -82,7 +89,7 @@ class RoutingModel:
             0.2,   # conjunction_count
         ]
 
-    def _save_model(self):
+    def save(self):
         """Save model to file."""
         self._ensure_dir()
         data = {
@@ -95,6 +102,24 @@ class RoutingModel:
         with open(self.model_path, 'w') as f:
             json.dump(data, f, indent=2)
 
+    def _score(self, feature_vector: Sequence[float]) -> float:
+        """Weighted complexity score for a feature vector."""
+        return sum(map(mul, self.weights, feature_vector))
+
+    @staticmethod
+    def _tier_for_score(complexity_score: float) -> Tuple[int, float]:
+        """Map a complexity score to a (tier, confidence) pair."""
+        if complexity_score < 0.3:
+            tier = 1
+            confidence = 1.0 - complexity_score / 0.3
+        elif complexity_score < 0.7:
+            tier = 2
+            confidence = 1.0 - abs(complexity_score - 0.5) / 0.2
+        else:
+            tier = 3
+            confidence = min(1.0, (complexity_score - 0.7) / 0.3 + 0.5)
+        return tier, min(1.0, max(0.0, confidence))
+
     def predict(self, query: str) -> RoutingPrediction:
         """
         Predict the optimal routing tier for a query.
@@ -105,29 +130,23 @@ class RoutingModel:
         Returns:
             RoutingPrediction with tier, confidence, and reasoning
         """
+        cached = self._prediction_cache.get(query)
+        if cached is not None:
+            self._prediction_cache.move_to_end(query)
+            return cached
+
+        prediction = self._predict_uncached(query)
+        self._prediction_cache[query] = prediction
+        if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+            self._prediction_cache.popitem(last=False)
+        return prediction
+
+    def _predict_uncached(self, query: str) -> RoutingPrediction:
+        """Compute a prediction from scratch."""
         features = extract_features(query)
-        feature_vector = features.to_vector()
 
-        # Calculate complexity score
-        complexity_score = sum(w * f for w, f in zip(self.weights, feature_vector))
-
-        # Add biases and determine tier
-        tier_scores = [
-            complexity_score + self.bias[0],  # Tier 1
-            complexity_score + self.bias[1],  # Tier 2
-            complexity_score + self.bias[2],  # Tier 3
-        ]
-
-        # Determine tier based on thresholds
-        if complexity_score < 0.3:
-            tier = 1
-            confidence = 1.0 - complexity_score / 0.3
-        elif complexity_score < 0.7:
-            tier = 2
-            confidence = 1.0 - abs(complexity_score - 0.5) / 0.2
-        else:
-            tier = 3
-            confidence = min(1.0, (complexity_score - 0.7) / 0.3 + 0.5)
+        # Calculate complexity score and determine tier based on thresholds
+        tier, confidence = self._tier_for_score(self._score(features.to_vector()))
 
         # Generate reasoning
         reasoning_parts = []
@@ -146,7 +165,7 @@ class RoutingModel:
 
         return RoutingPrediction(
             tier=tier,
-            confidence=min(1.0, max(0.0, confidence)),
+            confidence=confidence,
             reasoning=f"Tier {tier} recommended: {reasoning}",
             features=features.to_dict(),
         )
@@ -155,7 +174,8 @@ class RoutingModel:
         self,
         features: List[float],
         actual_tier: int,
-        learning_rate: float = 0.01
+        learning_rate: float = 0.01,
+        save: bool = True
     ):
         """
         Update model weights based on feedback.
@@ -164,22 +184,21 @@ class RoutingModel:
             features: Feature vector from the query
             actual_tier: The tier that should have been used (1, 2, or 3)
             learning_rate: Learning rate for weight updates
+            save: Persist the model after updating (batch callers save once)
         """
-        # Calculate current prediction
-        complexity_score = sum(w * f for w, f in zip(self.weights, features))
-
         # Target score based on actual tier
         target_scores = {1: 0.15, 2: 0.5, 3: 0.85}
         target = target_scores[actual_tier]
 
         # Update weights using gradient descent
-        error = target - complexity_score
-        for i in range(len(self.weights)):
-            self.weights[i] += learning_rate * error * features[i]
+        step = learning_rate * (target - self._score(features))
+        self.weights = [w + step * f for w, f in zip(self.weights, features)]
+        self._prediction_cache.clear()
 
         self.training_samples += 1
         self.last_trained = datetime.utcnow().isoformat()
-        self._save_model()
+        if save:
+            self.save()
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get model information and statistics."""
@@ -2,12 +2,12 @@
 
 import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
-from .features import extract_features
+from .features import featurize
 from .model import get_routing_model
 from ...config import data_path
 
@@ -74,6 +74,39 @@ class TrainingDataStore:
             return self.samples[-limit:]
         return self.samples
 
+    def get_samples_page(
+        self,
+        before: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[TrainingSample], Optional[int]]:
+        """
+        Get a page of samples using the sample position as a cursor.
+
+        Samples are only ever appended, so a position stays valid across
+        requests and, unlike a timestamp, never splits samples that share
+        the same time.
+
+        Args:
+            before: Only return samples stored before this position
+            limit: Maximum number of samples to return
+
+        Returns:
+            Tuple of (samples in chronological order, cursor for the next
+            older page or None if there are no more)
+        """
+        end = len(self.samples)
+        if before is not None:
+            end = max(0, min(before, end))
+        start = max(0, end - limit)
+
+        page = self.samples[start:end]
+        next_cursor = start if start > 0 and page else None
+        return page, next_cursor
+
+    def count(self) -> int:
+        """Get the number of stored samples."""
+        return len(self.samples)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get training data statistics."""
         if not self.samples:
@@ -128,8 +161,7 @@ def collect_training_sample(
     Returns:
         The created TrainingSample
     """
-    features = extract_features(query)
-    feature_vector = features.to_vector()
+    feature_vector = list(featurize(query))
 
     sample = TrainingSample(
         query=query,
@@ -172,14 +204,16 @@ def train_model(
     if not samples:
         return {'status': 'no_data', 'samples': 0}
 
-    # Training loop
+    # Training loop; persist once at the end rather than after every step
     for epoch in range(epochs):
         for sample in samples:
             model.update_weights(
                 features=sample.features,
                 actual_tier=sample.actual_tier,
-                learning_rate=learning_rate
+                learning_rate=learning_rate,
+                save=False
             )
+    model.save()
 
     return {
         'status': 'trained',
@@ -120,6 +120,39 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
             return json.load(f)
 
 
+def touch_conversation(conversation_id: str) -> Optional[int]:
+    """
+    Check that a conversation exists and return its message count.
+
+    Cheaper than get_conversation() when only existence and size are
+    needed: MongoDB projects the count server-side instead of shipping
+    every message.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Number of messages, or None if the conversation is not found
+    """
+    collection = get_conversations_collection()
+    if collection is not None:
+        # MongoDB storage
+        doc = collection.find_one(
+            {"_id": conversation_id},
+            {"_id": 0, "message_count": {"$size": {"$ifNull": ["$messages", []]}}}
+        )
+        if doc is None:
+            return None
+        return doc.get("message_count", 0)
+    else:
+        # JSON file storage
+        path = _get_conversation_path(conversation_id)
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            return len(json.load(f).get("messages", []))
+
+
 def save_conversation(conversation: Dict[str, Any]):
     """
     Save a conversation to storage.
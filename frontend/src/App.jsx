@@ -219,6 +219,28 @@ function App() {
             toast.success('Cached response found!');
             break;
 
+          case 'cache_hit_full':
+            // Cached response with all stages delivered in one event
+            setProcessingStatus((prev) => ({
+              ...prev,
+              cacheHit: event.data.cache_hit,
+              isProcessing: false,
+            }));
+            setStage1Results(event.data.stage1);
+            setStage2Results(event.data.stage2, event.data.metadata);
+            setStage3Result(event.data.stage3);
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage1 = event.data.stage1;
+              lastMsg.stage2 = event.data.stage2;
+              lastMsg.metadata = event.data.metadata;
+              lastMsg.stage3 = { ...event.data.stage3, isStreaming: false };
+              return { ...prev, messages };
+            });
+            toast.success('Cached response found!');
+            break;
+
           case 'stage1_5_start':
             // Factual verification starting
             setProcessingStatus((prev) => ({
@@ -88,6 +88,26 @@ export const api = {
     return response.json();
   },
 
+  /**
+   * Get feedback for many messages in one request.
+   * @param {Array<[string, number]>} items - (conversationId, messageIndex) pairs
+   * @returns {Promise<Object>} Map of "conversationId:messageIndex" to feedback list
+   */
+  async getFeedbackBatch(items) {
+    const response = await fetch(`${API_BASE}/api/feedback/batch`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ items }),
+    });
+    if (!response.ok) {
+      throw new Error('Failed to get feedback');
+    }
+    const data = await response.json();
+    return data.feedback;
+  },
+
   /**
    * Send a message and receive streaming updates.
    * @param {string} conversationId - The conversation ID
@@ -10,6 +10,7 @@ import ExportButton from './ExportButton';
 import QueryTemplates from './QueryTemplates';
 import FeedbackWidget from './FeedbackWidget';
 import ImageUpload from './ImageUpload';
+import { api } from '../api';
 import './ChatInterface.css';
 
 export default function ChatInterface({
@@ -30,6 +31,23 @@ export default function ChatInterface({
     scrollToBottom();
   }, [conversation]);
 
+  // Load existing feedback for all assistant messages in one request
+  const [feedbackByMessage, setFeedbackByMessage] = useState({});
+  const conversationId = conversation?.id;
+  useEffect(() => {
+    setFeedbackByMessage({});
+    if (!conversationId || !conversation?.messages?.length) return;
+    const items = conversation.messages
+      .map((msg, index) => (msg.role === 'assistant' ? [conversationId, index] : null))
+      .filter(Boolean);
+    if (items.length === 0) return;
+    api.getFeedbackBatch(items)
+      .then(setFeedbackByMessage)
+      .catch((error) => console.error('Failed to load feedback:', error));
+    // Only refetch when switching conversations
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [conversationId]);
+
   const handleSubmit = (e) => {
     e.preventDefault();
     if (input.trim() && !isLoading) {
@@ -126,6 +144,7 @@ export default function ChatInterface({
                     <FeedbackWidget
                       conversationId={conversation.id}
                       messageIndex={index}
+                      existingFeedback={feedbackByMessage[`${conversation.id}:${index}`]}
                     />
                   )}
                 </div>
@@ -1,9 +1,9 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
 import './FeedbackWidget.css';
 
 const API_BASE = import.meta.env.VITE_API_URL || 'http://localhost:8001';
 
-export default function FeedbackWidget({ conversationId, messageIndex }) {
+export default function FeedbackWidget({ conversationId, messageIndex, existingFeedback }) {
   const [rating, setRating] = useState(0);
   const [hoveredRating, setHoveredRating] = useState(0);
   const [submitted, setSubmitted] = useState(false);
@@ -11,6 +11,14 @@ export default function FeedbackWidget({ conversationId, messageIndex }) {
   const [showComment, setShowComment] = useState(false);
   const [comment, setComment] = useState('');
 
+  // Show previously submitted feedback as already rated
+  useEffect(() => {
+    if (existingFeedback?.length) {
+      setRating(existingFeedback[existingFeedback.length - 1].rating);
+      setSubmitted(true);
+    }
+  }, [existingFeedback]);
+
   const handleSubmit = async (selectedRating) => {
     if (submitting) return;
 
@@ -49,15 +49,12 @@ export default function ImageUpload({ onImagesChange, disabled }) {
         if (response.ok) {
           const data = await response.json();
 
-          // Get thumbnail
-          const thumbResponse = await fetch(`${API_BASE}/api/images/${data.id}/thumbnail`);
-          const thumbData = await thumbResponse.json();
-
+          // Preview straight from the binary endpoint (no base64 round-trip)
           newImages.push({
             id: data.id,
             filename: data.filename,
             size: data.size_bytes,
-            dataUrl: thumbData.data_url
+            dataUrl: `${API_BASE}/api/images/${data.id}/raw`
           });
         } else {
           const errorData = await response.json();